@@ -18,6 +18,8 @@ class CLAUSE(relations_sql.CRITERIA):
     PARENTHESES = False
     NAME = None
 
+    MEMO = True
+
     query = None
 
     def __init__(self, *args, **kwargs):
@@ -56,24 +58,31 @@ class CLAUSE(relations_sql.CRITERIA):
         Bind this statment to this clause for adding
         """
 
+        self.dirty()
         self.query = query
         return self
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
         """
         Concats the values
         """
 
-        super().generate(indent=indent, count=count, pad=pad, **kwargs)
-
-        if self.sql:
+        if self and (self.PARENTHESES or any(self.expressions)):
 
             one = pad * indent
             current = pad * (count * indent)
             next = current + one
             line = "\n" if indent else ' '
 
-            self.sql = f"{self.NAME}{line}{next}{self.sql}" if self.NAME else f"{one}{self.sql}"
+            yield f"{self.NAME}{line}{next}" if self.NAME else one
+            yield from super().fragments(args, indent=indent, count=count, pad=pad, **kwargs)
+
+        else:
+
+            # Nothing to write but still noted as written here so adding to them is noticed
+
+            for expression in self.expressions:
+                yield expression, kwargs
 
 
 class ARGS(CLAUSE):
@@ -88,6 +97,65 @@ class ARGS(CLAUSE):
         return super().add(*args)
 
 
+class WITH(CLAUSE):
+    """
+    Clause for WITH, of named queries in the order added
+    """
+
+    NAME = "WITH"
+    RECURSIVE = "WITH RECURSIVE" # NAME to use if recursive
+
+    CTE = relations_sql.CTE
+
+    recursive = False
+
+    def add(self, *args, RECURSIVE=None, MATERIALIZED=None, **kwargs): # pylint: disable=invalid-name
+        """
+        Add named queries, keeping their order since later ones can use earlier ones
+        """
+
+        self.dirty()
+
+        if len(args) == 1 and isinstance(args[0], dict) and not kwargs:
+            kwargs = args[0]
+            args = []
+
+        if RECURSIVE is not None:
+            self.recursive = RECURSIVE
+
+        for arg in args:
+            if not isinstance(arg, relations_sql.CTE):
+                raise relations_sql.SQLError(self, f"need CTE or keywords, not {arg}")
+            self.expressions.append(arg)
+
+        for label, expression in kwargs.items():
+            self.expressions.append(self.CTE(label, expression, materialized=MATERIALIZED))
+
+        return self.query or self
+
+    def shape(self, args):
+
+        return (self.__class__, self.recursive, self.shapes(self.expressions, args))
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
+        """
+        Concats the queries
+        """
+
+        if any(self.expressions):
+
+            current = pad * (count * indent)
+            next = current + (pad * indent)
+            line = "\n" if indent else ' '
+
+            yield f"{self.RECURSIVE if self.recursive else self.NAME}{line}{next}"
+            yield from relations_sql.CRITERIA.fragments(self, args, indent=indent, count=count, pad=pad, **kwargs)
+
+        else:
+
+            yield from super().fragments(args, indent=indent, count=count, pad=pad, **kwargs)
+
+
 class OPTIONS(ARGS):
     """
     Beginning of a SELECT query
@@ -120,6 +188,124 @@ class FROM(CLAUSE):
     KWARGS = relations_sql.AS
 
 
+class JOIN(CLAUSE):
+    """
+    Clause for JOIN, of a table ON criteria
+    """
+
+    NAME = "JOIN"
+
+    ARGS = relations_sql.VALUE
+    KWARGS = relations_sql.OP
+    TABLE = relations_sql.TABLE_NAME
+    AS = relations_sql.AS
+
+    DELIMITTER = " AND "
+
+    table = None
+
+    def __init__(self, TABLE, *args, AS=None, **kwargs): # pylint: disable=invalid-name
+
+        self.expressions = []
+
+        if not isinstance(TABLE, relations_sql.SQL):
+            TABLE = self.TABLE(TABLE)
+
+        self.table = TABLE if AS is None else self.AS(AS, TABLE)
+
+        self(*args, **kwargs)
+
+    def __len__(self):
+
+        return len(self.table) + len(self.expressions)
+
+    def shape(self, args):
+
+        return (self.__class__, self.table.shape(args), self.shapes(self.expressions, args))
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
+        """
+        Generates the table and what it's ON
+        """
+
+        current = pad * (count * indent)
+        next = current + (indent * pad)
+        line = "\n" if indent else ' '
+
+        yield f"{self.NAME}{line}{next}"
+        yield self.table, dict(indent=indent, count=count+1, pad=pad, **kwargs)
+
+        if any(self.expressions):
+            yield f"{line}{current}ON{line}{next}"
+            yield from relations_sql.CRITERIA.fragments(self, args, indent=indent, count=count, pad=pad, **kwargs)
+
+
+class LEFT_JOIN(JOIN):
+    """
+    Clause for LEFT JOIN
+    """
+
+    NAME = "LEFT JOIN"
+
+
+class RIGHT_JOIN(JOIN):
+    """
+    Clause for RIGHT JOIN
+    """
+
+    NAME = "RIGHT JOIN"
+
+
+class FULL_JOIN(JOIN):
+    """
+    Clause for FULL JOIN
+    """
+
+    NAME = "FULL JOIN"
+
+
+class CROSS_JOIN(JOIN):
+    """
+    Clause for CROSS JOIN
+    """
+
+    NAME = "CROSS JOIN"
+
+    def add(self, *args, **kwargs):
+        """
+        Every row joins every row, so there's nothing to be ON
+        """
+
+        if args or kwargs:
+            raise relations_sql.SQLError(self, "CROSS JOIN takes no ON")
+
+        return self.query or self
+
+
+class JOINS(ARGS):
+    """
+    Clause for all the JOINs, in the order added
+    """
+
+    ARGS = JOIN
+
+    JOIN = JOIN
+    LEFT_JOIN = LEFT_JOIN
+    RIGHT_JOIN = RIGHT_JOIN
+    FULL_JOIN = FULL_JOIN
+    CROSS_JOIN = CROSS_JOIN
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
+        """
+        Concats the joins
+        """
+
+        current = pad * (count * indent)
+        line = "\n" if indent else ' '
+
+        yield from self.delimit(self.expressions, f"{line}{current}", indent=indent, count=count, pad=pad, **kwargs)
+
+
 class WHERE(CLAUSE):
     """
     Clause for WHERE
@@ -183,6 +369,8 @@ class LIMIT(CLAUSE):
         Add total and offset
         """
 
+        self.dirty()
+
         if len(args) == 1 and isinstance(args[0], dict) and total is None and offset is None:
 
             total = args[0].get("total")
@@ -215,12 +403,12 @@ class LIMIT(CLAUSE):
 
         return self.query or self
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
         """
         Concats the values
         """
 
-        super().generate(**kwargs)
+        yield from super().fragments(args, **kwargs)
 
 
 class SET(CLAUSE):
@@ -241,6 +429,7 @@ class VALUES(CLAUSE):
     NAME = "VALUES"
 
     ARGS = relations_sql.LIST
+    ROWS = relations_sql.ROWS
 
     DELIMITTER = None
 
@@ -265,14 +454,71 @@ class VALUES(CLAUSE):
 
             self.columns = columns
 
+    def order(self, values):
+        """
+        Puts a dict of values in the order of the columns
+        """
+
+        self.column(sorted(values.keys()))
+
+        args = []
+
+        for column in self.columns:
+            if column not in values:
+                raise relations_sql.SQLError(self, f"missing column {column} in {values}")
+            args.append(values[column])
+
+        return args
+
+    def rows(self, rows):
+        """
+        Add rows from a dict of lists or a list of lists or dicts, without expressions for each value
+        """
+
+        if isinstance(rows, dict):
+
+            self.column(sorted(rows.keys()))
+
+            for column in self.columns:
+                if column not in rows:
+                    raise relations_sql.SQLError(self, f"missing column {column} in {sorted(rows.keys())}")
+
+            if len({len(rows[column]) for column in self.columns}) > 1:
+                raise relations_sql.SQLError(self, f"different lengths for columns {self.columns}")
+
+            rows = zip(*[rows[column] for column in self.columns])
+
+        else:
+
+            rows = (self.order(row) if isinstance(row, dict) else row for row in rows)
+
+        rows = self.ROWS(rows)
+
+        if rows:
+            if self.columns is not None and len(rows.rows[0]) != len(self.columns):
+                raise relations_sql.SQLError(self, f"wrong values {rows.rows[0]} for columns {self.columns}")
+
+            self.expressions.append(rows)
+
     def add(self, *args, **kwargs):
         """
-        Add a row to VALUES
+        Add a row to VALUES, or many with ROWS
         """
 
+        self.dirty()
+
         if kwargs.get("COLUMNS"):
             self.column(kwargs.pop("COLUMNS"))
 
+        if "ROWS" in kwargs:
+
+            if args or len(kwargs) > 1:
+                raise relations_sql.SQLError(self, "add ROWS by themselves")
+
+            self.rows(kwargs.pop("ROWS"))
+
+            return self.query or self
+
         if args and kwargs:
             raise relations_sql.SQLError(self, "add list or dict but not both")
 
@@ -282,14 +528,7 @@ class VALUES(CLAUSE):
 
         if kwargs:
 
-            self.column(sorted(kwargs.keys()))
-
-            args = []
-
-            for column in self.columns:
-                if column not in kwargs:
-                    raise relations_sql.SQLError(self, f"missing column {column} in {kwargs}")
-                args.append(kwargs[column])
+            args = self.order(kwargs)
 
         if args:
             if self.columns is not None and len(args) != len(self.columns):
@@ -299,13 +538,86 @@ class VALUES(CLAUSE):
 
         return self.query or self
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def each(self):
         """
-        Concats the values
+        Yields each row as the expression it's in, its index there if ROWS, and its args
+        """
+
+        for expression in self.expressions:
+
+            if isinstance(expression, relations_sql.ROWS):
+
+                for index, row in enumerate(expression.rows):
+                    if index in expression.mixed:
+                        args = []
+                        expression.row(index, args)
+                        yield expression, index, args
+                    else:
+                        yield expression, index, row
+
+            elif expression:
+
+                args = []
+
+                try:
+                    expression.shape(args)
+                except relations_sql.SQLError:
+                    expression.generate()
+                    args = expression.args
+
+                yield expression, None, args
+
+    @staticmethod
+    def size(args):
         """
+        Estimated bytes sending the args takes, with their placeholders
+        """
+
+        size = 3 * len(args)
+
+        for arg in args:
+            size += len(arg.encode()) if isinstance(arg, str) else len(str(arg))
+
+        return size
+
+    def batches(self, rows=None, placeholders=None, payload=None, used=0, sized=0):
+        """
+        Splits the rows into lists of expressions, each within the most rows, placeholders, and estimated bytes,
+        starting with placeholders used and bytes sized by the rest of the query
+        """
+
+        batch = []
+        count, places, total = 0, used, sized
 
-        sql = []
-        self.args = []
+        for expression, index, args in self.each():
+
+            size = self.size(args) if payload else 0
+
+            if batch and ( # pylint: disable=too-many-boolean-expressions
+                (rows and count + 1 > rows) or
+                (placeholders and places + len(args) > placeholders) or
+                (payload and total + size > payload)
+            ):
+                yield [span[0] if span[1] is None else span[0].slice(span[1], span[2]) for span in batch]
+                batch = []
+                count, places, total = 0, used, sized
+
+            if index is not None and batch and batch[-1][0] is expression and batch[-1][2] == index:
+                batch[-1][2] += 1
+            else:
+                batch.append([expression, index, None if index is None else index + 1])
+
+            count += 1
+            places += len(args)
+            total += size
+
+        if batch:
+            yield [span[0] if span[1] is None else span[0].slice(span[1], span[2]) for span in batch]
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
+        """
+        Concats the values
+        """
 
         count += 1
         current = pad * (count * indent)
@@ -314,5 +626,6 @@ class VALUES(CLAUSE):
         left, right = (f"(\n{next}", f"\n{current})") if indent else ('(', ')')
         delimitter = f"{right},{left}"
 
-        self.express(self.expressions, sql, indent=indent, count=count+1, pad=pad, **kwargs)
-        self.sql = f"{self.NAME}{line}{current}{left}{delimitter.join(sql)}{right}"
+        yield f"{self.NAME}{line}{current}{left}"
+        yield from self.delimit(self.expressions, delimitter, indent=indent, count=count+1, pad=pad, **kwargs)
+        yield right
@@ -2,6 +2,10 @@
 Module for CRITERIA
 """
 
+import numbers
+import hashlib
+import datetime
+
 import relations_sql
 
 
@@ -11,11 +15,18 @@ class CRITERIA(relations_sql.LIST):
     """
 
     ARGS = None
+    IN = relations_sql.IN
+    BETWEEN = relations_sql.BETWEEN
 
     DELIMITTER = None
     PARENTHESES = True
 
-    expressions = None
+    PARENTS = True
+
+    HEAD = 256 # characters of what's generated, and its args, that identities sort by before a digest of the rest
+
+    sql = None  # until generated, as these keep what's set in a __dict__ rather than slots
+    args = None
 
     def __init__(self, *args):
 
@@ -33,6 +44,8 @@ class CRITERIA(relations_sql.LIST):
         Add expressiona
         """
 
+        self.dirty()
+
         expressions = []
 
         if len(args) == 1 and isinstance(args[0], list):
@@ -46,7 +59,359 @@ class CRITERIA(relations_sql.LIST):
             else:
                 self.expressions.append(self.ARGS(expression))
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def shape(self, args):
+
+        return (self.__class__, len(self), self.shapes(self.expressions, args))
+
+    def nodes(self):
+        """
+        This and every CRITERIA within, parents before children
+        """
+
+        nodes = []
+        stack = [self]
+
+        while stack:
+
+            node = stack.pop()
+            nodes.append(node)
+
+            for expression in node.expressions:
+                if isinstance(expression, relations_sql.NOT):
+                    expression = expression.expression
+                if isinstance(expression, CRITERIA) and not isinstance(expression, relations_sql.CLAUSE):
+                    stack.append(expression)
+
+        return nodes
+
+    def optimize(self):
+        """
+        Simplifies this and every AND or OR within, from the bottom up
+        """
+
+        identities = {}
+
+        for node in reversed(self.nodes()):
+            node.simplify(identities)
+
+        return self
+
+    def normalize(self):
+        """
+        Puts this and every AND or OR within in a canonical order, from the bottom up
+        """
+
+        identities = {}
+
+        for node in reversed(self.nodes()):
+            node.canonical(identities)
+
+        return self
+
+    def key(self):
+        """
+        Hashable key, once normalized, that's the same for criteria differing only in order
+        """
+
+        return self.identify(self.normalize())
+
+    @staticmethod
+    def constant(expression):
+        """
+        Whether an expression is always true or false, None if it depends
+        """
+
+        if isinstance(expression, relations_sql.IN) and not expression.right:
+            return bool(expression.invert)
+
+        if isinstance(expression, relations_sql.VALUE) and isinstance(expression.value, bool):
+            return expression.value
+
+        return None
+
+    @classmethod
+    def identify(cls, expression, identities=None):
+        """
+        What an expression generates, to tell which are the same
+
+        With identities, keyed by id, it's the start of the sql and args, and a digest of everything within,
+        worked out from those of the expressions within rather than by generating them again, so a pass from
+        the bottom up identifies each expression once, no matter how deep
+        """
+
+        if identities is None:
+            expression.generate()
+            return (expression.sql, repr(expression.args))
+
+        stack = []
+
+        parent, fragments, pieces, reprs, args = expression, None, [], [], []
+
+        while True:
+
+            identity = None
+            known = identities.get(id(parent))
+
+            if known is not None and known[0] is parent:
+                identity = known[1]
+            elif not relations_sql.EXPRESSION.writes(parent.__class__):
+                parent.generate()
+                identity = cls.identity([parent.sql], [repr(arg) for arg in parent.args])
+            else:
+
+                if fragments is None:
+                    fragments = parent.fragments(args)
+
+                for fragment in fragments:
+
+                    reprs.extend(repr(arg) for arg in args)
+                    args.clear()
+
+                    if isinstance(fragment, str):
+                        pieces.append(fragment)
+                    elif fragment[0]:
+                        stack.append((parent, fragments, pieces, reprs, args))
+                        parent, fragments, pieces, reprs, args = fragment[0], None, [], [], []
+                        break
+
+                else:
+
+                    reprs.extend(repr(arg) for arg in args)
+                    identity = cls.identity(pieces, reprs)
+
+                # Identify what's within first
+
+                if identity is None:
+                    continue
+
+            # Keeping the expression keeps its id from being reused while identities are
+
+            identities[id(parent)] = (parent, identity)
+
+            if not stack:
+                return identity
+
+            parent, fragments, pieces, reprs, args = stack.pop()
+            pieces.append(identity)
+            reprs.append(identity)
+
+    @classmethod
+    def identity(cls, pieces, reprs):
+        """
+        Identity from pieces of sql and reprs of args, with the identities of what's within among them,
+        as the first HEAD characters of the sql and of the args, then a digest of it all
+        """
+
+        heads = []
+
+        for items, index, between in ((pieces, 0, ""), (reprs, 1, ", ")):
+
+            texts = []
+            size = 0
+
+            for item in items:
+                text = item if isinstance(item, str) else item[index]
+                if text:
+                    texts.append(text)
+                    size += len(text) + len(between)
+                    if size >= cls.HEAD:
+                        break
+
+            heads.append(between.join(texts)[:cls.HEAD])
+
+        digest = hashlib.blake2b(repr((
+            tuple(piece if isinstance(piece, str) else piece[2] for piece in pieces),
+            tuple(item if isinstance(item, str) else item[2] for item in reprs)
+        )).encode(), digest_size=16).digest()
+
+        return (heads[0], heads[1], digest)
+
+    @staticmethod
+    def bounds(expression):
+        """
+        The lower and upper bounds a criterion puts on its left, as (value, inclusive), None if it doesn't
+
+        Only numbers, dates, and times count, as how strings compare depends on the database's collation
+        """
+
+        if (
+            not isinstance(expression, (relations_sql.GT, relations_sql.GTE, relations_sql.LT, relations_sql.LTE, relations_sql.BETWEEN)) or
+            expression.invert or expression.CAST
+        ):
+            return None
+
+        values = expression.right.expressions if isinstance(expression, relations_sql.BETWEEN) else [expression.right]
+
+        if not all(
+            isinstance(value, relations_sql.VALUE) and not value.jsonify and not isinstance(value.value, bool) and
+            isinstance(value.value, (numbers.Number, datetime.date, datetime.time))
+            for value in values
+        ):
+            return None
+
+        if isinstance(expression, relations_sql.BETWEEN):
+            return (values[0].value, True), (values[1].value, True)
+
+        if isinstance(expression, (relations_sql.GT, relations_sql.GTE)):
+            return (values[0].value, isinstance(expression, relations_sql.GTE)), None
+
+        return None, (values[0].value, isinstance(expression, relations_sql.LTE))
+
+    def ranges(self, expressions, identities=None): # pylint: disable=too-many-branches,too-many-locals
+        """
+        Keeps just the tightest lower and upper bound on each left, as a BETWEEN if both are inclusive
+        """
+
+        ranges = {}
+
+        for expression in expressions:
+            bounds = self.bounds(expression)
+            if bounds is not None:
+                ranges.setdefault(self.identify(expression.left, identities), []).append((expression, bounds))
+
+        replaced = {}
+
+        for members in ranges.values():
+
+            if len(members) < 2:
+                continue
+
+            lower = upper = None
+
+            try:
+                for expression, (low, high) in members:
+                    if low is not None and (lower is None or low[0] > lower[0] or (low[0] == lower[0] and not low[1])):
+                        lower = (low[0], low[1], expression)
+                    if high is not None and (upper is None or high[0] < upper[0] or (high[0] == upper[0] and not high[1])):
+                        upper = (high[0], high[1], expression)
+            except TypeError:
+                continue
+
+            sources = []
+
+            for bound in (lower, upper):
+                if bound and all(bound[2] is not source for source in sources):
+                    sources.append(bound[2])
+
+            if lower and upper and lower[1] and upper[1] and len(sources) > 1:
+                kept = [self.BETWEEN(members[0][0].left, [lower[0], upper[0]])]
+            elif len(sources) > 1 and any(isinstance(source, relations_sql.BETWEEN) for source in sources):
+                continue
+            else:
+                kept = sources
+
+            for index, (expression, _) in enumerate(members):
+                replaced[id(expression)] = kept if index == 0 else []
+
+        simplified = []
+
+        for expression in expressions:
+            simplified.extend(replaced.get(id(expression), [expression]))
+
+        return simplified
+
+    def canonical(self, identities=None):
+        """
+        Sorts the values of IN's within and then what's within by what it generates, like add sorts keywords
+        """
+
+        if (self.DELIMITTER or '').strip() not in ("AND", "OR"):
+            return
+
+        for expression in self.expressions:
+
+            if isinstance(expression, relations_sql.NOT):
+                expression = expression.expression
+
+            if (
+                not isinstance(expression, relations_sql.IN) or not isinstance(expression.right, relations_sql.LIST) or
+                not all(isinstance(value, relations_sql.VALUE) and not value.jsonify for value in expression.right.expressions)
+            ):
+                continue
+
+            try:
+                values = sorted(expression.right.expressions, key=lambda value: value.value)
+            except TypeError:
+                continue
+
+            if values != expression.right.expressions:
+                expression.right.expressions = values
+
+        self.dirty()
+        self.expressions = sorted(self.expressions, key=lambda expression: self.identify(expression, identities))
+
+    def simplify(self, identities=None): # pylint: disable=too-many-branches,too-many-locals
+        """
+        Flattens what's within, short circuits what's constant, drops duplicates, and folds EQ's into IN's
+        """
+
+        conjunction = (self.DELIMITTER or '').strip()
+
+        if conjunction not in ("AND", "OR"):
+            return
+
+        expressions = []
+
+        for expression in self.expressions:
+            if not expression:
+                continue
+            if isinstance(expression, CRITERIA) and not isinstance(expression, relations_sql.CLAUSE) and (
+                (expression.DELIMITTER or '').strip() == conjunction or len(expression.expressions) == 1
+            ):
+                expressions.extend(each for each in expression.expressions if each)
+            else:
+                expressions.append(expression)
+
+        # AND stops at the first false and OR at the first true, else they're left out
+
+        deciding = conjunction == "OR"
+        constants = []
+        remaining = []
+
+        for expression in expressions:
+            constant = self.constant(expression)
+            if constant is None:
+                remaining.append(expression)
+            elif constant == deciding:
+                remaining = [expression]
+                break
+            else:
+                constants.append(expression)
+        else:
+            if not remaining and constants:
+                remaining = constants[:1]
+
+        expressions = []
+        seen = set()
+
+        for expression in remaining:
+            identity = self.identify(expression, identities)
+            if identity not in seen:
+                seen.add(identity)
+                expressions.append(expression)
+
+        if conjunction == "AND":
+
+            expressions = self.ranges(expressions, identities)
+
+        if conjunction == "OR":
+
+            lefts = {}
+
+            for expression in expressions:
+                if isinstance(expression, relations_sql.EQ) and not expression.invert and isinstance(expression.right, relations_sql.VALUE):
+                    lefts.setdefault(self.identify(expression.left, identities), []).append(expression)
+
+            for equals in lefts.values():
+                if len(equals) > 1:
+                    expressions[expressions.index(equals[0])] = self.IN(equals[0].left, [equal.right for equal in equals])
+                    for equal in equals[1:]:
+                        expressions.remove(equal)
+
+        self.dirty()
+        self.expressions = expressions
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
         """
         Concats the values
         """
@@ -58,13 +423,10 @@ class CRITERIA(relations_sql.LIST):
         delimitter = f"{self.DELIMITTER.rstrip()}{line}{next}" if indent else self.DELIMITTER
         left, right = (f"({line}{next}", f"{line}{current})") if self.PARENTHESES else ('', '')
 
-        sql = []
-        self.sql = ""
-        self.args = []
-
         if self:
-            self.express(self.expressions, sql, indent=indent, count=count+1, pad=' ', **kwargs)
-            self.sql = f"{left}{delimitter.join(sql)}{right}"
+            yield left
+            yield from self.delimit(self.expressions, delimitter, indent=indent, count=count+1, pad=' ', **kwargs)
+            yield right
 
 
 class AND(CRITERIA):
@@ -98,14 +460,16 @@ class SETS(relations_sql.CRITERION):
 
         return 1
 
-    def generate(self, **kwargs):
+    def shape(self, args):
+
+        return (self.__class__, self.expression.shape(args))
+
+    def fragments(self, args, **kwargs):
         """
         Concats the values
         """
 
-        self.expression.generate(**kwargs)
-        self.sql = self.expression.sql
-        self.args = self.expression.args
+        yield self.expression, kwargs
 
     @staticmethod
     def ensure(value):
@@ -145,6 +509,7 @@ class ANY(SETS):
     LEFT = relations_sql.COLUMN_NAME
     VALUE = relations_sql.VALUE
     CONTAINS = relations_sql.CONTAINS
+    OVERLAPS = None # CRITERION to check all of right at once with one arg (if any)
 
     def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
 
@@ -156,7 +521,10 @@ class ANY(SETS):
 
         right = self.ensure(right)
 
-        self.expression = self.OR([self.CONTAINS(left, self.VALUE([value])) for value in right])
+        if self.OVERLAPS is not None:
+            self.expression = self.OVERLAPS(left, right)
+        else:
+            self.expression = self.OR([self.CONTAINS(left, self.VALUE([value])) for value in right])
 
 
 class ALL(SETS):
@@ -196,11 +564,15 @@ class OP:
         'start': relations_sql.START,
         'end': relations_sql.END,
         'in': relations_sql.IN,
+        'between': relations_sql.BETWEEN,
+        'exists': relations_sql.EXISTS,
         'has': HAS,
         'any': ANY,
         'all': ALL
     }
 
+    FIELDS = relations_sql.CACHE(size=4096) # field, operand, and invert parsed by class and key
+
     def __new__(cls, *args, **kwargs):
 
         field = None
@@ -208,6 +580,7 @@ class OP:
         invert = kwargs.pop("INVERT", False)
         jsonify = kwargs.pop("JSONIFY", False)
         extracted = kwargs.pop("EXTRACTED", False)
+        array = kwargs.pop("ARRAY", None)
 
         if len(args) == 2:
             field, value = args
@@ -216,20 +589,50 @@ class OP:
         else:
             raise relations_sql.SQLError(cls, f"need single pair in {kwargs} or double in {args}")
 
-        operand = "eq"
+        field, operand, inverted = cls.parse(field)
+        invert = invert or inverted
+
+        if issubclass(cls.CRITERIONS[operand], relations_sql.EXISTS):
+            field = None # just there to keep keywords apart
+
+        if array is not None:
 
-        if '__' in field:
-            pieces = field.rsplit('__', 1)
-            if pieces[-1] in cls.CRITERIONS:
-                field, operand = pieces
-            elif pieces[-1].startswith('not_'):
-                operands = pieces[-1].split('not_', 1)
-                if operands[-1] in cls.CRITERIONS:
-                    invert = True
-                    field = pieces[0]
-                    operand = operands[-1]
+            if not issubclass(cls.CRITERIONS[operand], relations_sql.IN):
+                raise relations_sql.SQLError(cls, f"ARRAY only for in, not {operand}")
+
+            return cls.CRITERIONS[operand](field, value, invert=invert, jsonify=jsonify, extracted=extracted, array=array)
 
         if invert and cls.CRITERIONS[operand].INVERT is None:
             return cls.NOT(cls.CRITERIONS[operand](field, value, jsonify=jsonify, extracted=extracted))
 
         return cls.CRITERIONS[operand](field, value, invert=invert, jsonify=jsonify, extracted=extracted)
+
+    @classmethod
+    def parse(cls, key):
+        """
+        Splits a key into field, operand, and whether to invert, remembering it in FIELDS
+        """
+
+        if '__' not in key:
+            return key, "eq", False
+
+        parsed = cls.FIELDS.get((cls, key))
+
+        if parsed is not None:
+            return parsed
+
+        field = key
+        operand = "eq"
+        invert = False
+
+        pieces = field.rsplit('__', 1)
+        if pieces[-1] in cls.CRITERIONS:
+            field, operand = pieces
+        elif pieces[-1].startswith('not_'):
+            operands = pieces[-1].split('not_', 1)
+            if operands[-1] in cls.CRITERIONS:
+                invert = True
+                field = pieces[0]
+                operand = operands[-1]
+
+        return cls.FIELDS.set((cls, key), (field, operand, invert))
@@ -4,6 +4,9 @@ Module for all Relations SQL Criterions, pieces of Criteria
 
 # pylint: disable=isinstance-second-argument-not-valid-type
 
+import copy
+import json
+
 import relations_sql
 
 class CRITERION(relations_sql.EXPRESSION):
@@ -21,8 +24,11 @@ class CRITERION(relations_sql.EXPRESSION):
     REVERSE = False
     CAST = None
 
-    left = None    # Left expression
-    right = None   # Right expression
+    __slots__ = (
+        "left",     # Left expression
+        "right",    # Right expression
+        "invert"    # Whether to use INVERT
+    )
 
     def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
 
@@ -49,34 +55,40 @@ class CRITERION(relations_sql.EXPRESSION):
 
         return len(self.left) + len(self.right)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def shape(self, args):
+
+        expressions = [self.right, self.left] if self.REVERSE else [self.left, self.right]
+
+        return (self.__class__, self.invert, self.shapes(expressions, args))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs): # pylint: disable=too-many-locals
         """
         Generate the left and right with operand in between
         """
 
-        sql = []
-        self.args = []
-
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ''
-        left, right = ('', '') if isinstance(self.right, self.RIGHT) and not self.PARENTHESES else (f"({line}{next}", f"{line}{current})")
-
-        if self.REVERSE:
-            self.express(self.right, sql, indent=indent, count=count+1, **kwargs)
-            self.express(self.left, sql, indent=indent, count=count+1, **kwargs)
-            sql[0] = f"{left}{sql[0]}{right}"
-        else:
-            self.express(self.left, sql, indent=indent, count=count+1, **kwargs)
-            self.express(self.right, sql, indent=indent, count=count+1, **kwargs)
-            sql[1] = f"{left}{sql[1]}{right}"
+        bare = isinstance(self.right, (self.RIGHT, relations_sql.NAME)) and not self.PARENTHESES
+        left, right = ('', '') if bare else (f"({line}{next}", f"{line}{current})")
 
-        operand = self.INVERT if self.invert else self.OPERAND
+        before, middle, after = self.pieces(self.INVERT if self.invert else self.OPERAND) # pylint: disable=unbalanced-tuple-unpacking
+        cast, casted = self.pieces(self.CAST) if self.CAST else ('', '')
 
-        if self.CAST:
-            sql = [self.CAST % expression for expression in sql]
+        nested = dict(indent=indent, count=count+1, **kwargs)
 
-        self.sql = operand % tuple(sql)
+        if self.REVERSE:
+            yield f"{before}{cast}{left}"
+            yield self.right, nested
+            yield f"{right}{casted}{middle}{cast}"
+            yield self.left, nested
+            yield f"{casted}{after}"
+        else:
+            yield f"{before}{cast}"
+            yield self.left, nested
+            yield f"{casted}{middle}{cast}{left}"
+            yield self.right, nested
+            yield f"{right}{casted}{after}"
 
 
 class NULL(CRITERION):
@@ -88,23 +100,28 @@ class NULL(CRITERION):
     INVERT = "%s IS NOT NULL"
     JSONNULL = None
 
+    __slots__ = ()
+
     def __len__(self):
 
         return 1
 
-    def generate(self, **kwargs):
+    def shape(self, args):
 
-        sql = []
-        self.args = []
+        return (self.__class__, bool(self.right.value) == bool(self.invert), self.shapes([self.left], args))
 
-        self.express(self.left, sql, **kwargs)
+    def fragments(self, args, **kwargs):
 
-        if isinstance(self.left, relations_sql.COLUMN_NAME) and self.left.path and self.JSONNULL is not None:
-            sql[0] = self.JSONNULL % sql[0]
+        before, after = self.pieces(self.INVERT if bool(self.right.value) == bool(self.invert) else self.OPERAND) # pylint: disable=unbalanced-tuple-unpacking
 
-        OPERAND = self.INVERT if bool(self.right.value) == bool(self.invert) else self.OPERAND
+        if isinstance(self.left, relations_sql.COLUMN_NAME) and self.left.path and self.JSONNULL is not None:
+            null, nulled = self.pieces(self.JSONNULL) # pylint: disable=unbalanced-tuple-unpacking
+            before = f"{before}{null}"
+            after = f"{nulled}{after}"
 
-        self.sql = OPERAND % tuple(sql)
+        yield before
+        yield self.left, kwargs
+        yield after
 
 
 class EQ(CRITERION):
@@ -115,6 +132,8 @@ class EQ(CRITERION):
     OPERAND = "%s=%s"
     INVERT = "%s!=%s"
 
+    __slots__ = ()
+
 
 class GT(CRITERION):
     """
@@ -123,6 +142,8 @@ class GT(CRITERION):
 
     OPERAND = "%s>%s"
 
+    __slots__ = ()
+
 
 class GTE(CRITERION):
     """
@@ -131,6 +152,8 @@ class GTE(CRITERION):
 
     OPERAND = "%s>=%s"
 
+    __slots__ = ()
+
 
 class LT(CRITERION):
     """
@@ -139,6 +162,8 @@ class LT(CRITERION):
 
     OPERAND = "%s<%s"
 
+    __slots__ = ()
+
 
 class LTE(CRITERION):
     """
@@ -147,6 +172,8 @@ class LTE(CRITERION):
 
     OPERAND = "%s<=%s"
 
+    __slots__ = ()
+
 
 class LIKE(CRITERION):
     """
@@ -159,6 +186,8 @@ class LIKE(CRITERION):
     BEFORE = "%"
     AFTER = "%"
 
+    __slots__ = ()
+
     def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
 
         if kwargs:
@@ -177,6 +206,8 @@ class START(LIKE):
 
     BEFORE = ""
 
+    __slots__ = ()
+
 
 class END(LIKE):
     """
@@ -185,6 +216,48 @@ class END(LIKE):
 
     AFTER = ""
 
+    __slots__ = ()
+
+
+class BETWEEN(CRITERION):
+    """
+    For BETWEEN, with right as the low and high
+    """
+
+    RIGHT = relations_sql.LIST
+
+    OPERAND = "%s BETWEEN %s AND %s"
+    INVERT = "%s NOT BETWEEN %s AND %s"
+
+    __slots__ = ()
+
+    def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
+
+        if kwargs:
+            left, right = list(kwargs.items())[0]
+
+        if isinstance(right, relations_sql.SQL) or not isinstance(right, (list, tuple)) or len(right) != 2:
+            raise relations_sql.SQLError(self, f"BETWEEN needs low and high, not {right}")
+
+        super().__init__(left, list(right), invert=invert, jsonify=jsonify, extracted=extracted)
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
+        """
+        Generate the left, low, and high within the operand
+        """
+
+        before, low, high, after = self.pieces(self.INVERT if self.invert else self.OPERAND) # pylint: disable=unbalanced-tuple-unpacking
+
+        nested = dict(indent=indent, count=count+1, pad=pad, **kwargs)
+
+        yield before
+        yield self.left, nested
+        yield low
+        yield self.right.expressions[0], nested
+        yield high
+        yield self.right.expressions[1], nested
+        yield after
+
 
 class IN(CRITERION):
     """
@@ -199,21 +272,156 @@ class IN(CRITERION):
     OPERAND = "%s IN %s"
     INVERT = "%s NOT IN %s"
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    ARRAY = None        # OPERAND to use binding all the values as one arg (if any)
+    ARRAY_INVERT = None # ARRAY to use (if not)
+    ARRAY_SIZE = None   # Use ARRAY for this many values or more (if any)
+    ARRAY_JSON = False  # Whether to bind the values as JSON rather than a list
+
+    BUCKET = None       # Pad values to the next power of this by repeating the last (if any)
+
+    __slots__ = (
+        "array",    # Whether to use ARRAY, None for if ARRAY_SIZE values or more
+    )
+
+    def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, array=None, bucket=None, **kwargs):
+
+        if array and (self.ARRAY is None or (invert and self.ARRAY_INVERT is None)):
+            raise relations_sql.SQLError(self, "no array without ARRAY operand")
+
+        if bucket is None:
+            bucket = self.BUCKET
+
+        if bucket is not None and (not isinstance(bucket, int) or isinstance(bucket, bool) or bucket < 2):
+            raise relations_sql.SQLError(self, f"bucket {bucket} must be an int of 2 or more")
+
+        given = list(kwargs.values())[0] if kwargs else right
+
+        super().__init__(left, right, invert=invert, jsonify=jsonify, extracted=extracted, **kwargs)
+
+        self.array = array
+
+        # Copy a LIST given rather than change it under whatever else has it
+
+        if isinstance(self.right, relations_sql.LIST) and bucket is not None and self.right.bucket != bucket:
+            if self.right is given:
+                self.right = copy.copy(self.right)
+            self.right.bucket = bucket
+
+    def arrayed(self):
         """
-        Generate the left and right with operand in between
+        Whether to bind all the values as one arg
         """
 
+        if not isinstance(self.right, relations_sql.LIST) or not self.right or self.array is False:
+            return False
+
+        if self.array is None and (self.ARRAY_SIZE is None or len(self.right) < self.ARRAY_SIZE):
+            return False
+
+        if (self.ARRAY_INVERT if self.invert else self.ARRAY) is None:
+            return False
+
+        return all(
+            isinstance(expression, relations_sql.VALUE) and not expression.jsonify
+            for expression in self.right.expressions
+        )
+
+    def values(self):
+        """
+        All the values as one arg
+        """
+
+        values = [expression.value for expression in self.right.expressions]
+
+        return json.dumps(values) if self.ARRAY_JSON else values
+
+    def shape(self, args):
+
+        if self.right and self.arrayed():
+            shape = self.left.shape(args)
+            args.append(self.values())
+            return (self.__class__, self.invert, shape)
+
         if self.right:
+            return super().shape(args)
+
+        args.append(self.invert)
+
+        return (self.__class__, self.invert)
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
+        """
+        Generate the left and right with operand in between
+        """
+
+        if self.right and self.arrayed():
+
+            before, middle, after = self.pieces(self.ARRAY_INVERT if self.invert else self.ARRAY) # pylint: disable=unbalanced-tuple-unpacking
+
+            yield before
+            yield self.left, dict(indent=indent, count=count+1, pad=pad, **kwargs)
+            args.append(self.values())
+            yield f"{middle}{self.PLACEHOLDER}{after}"
 
-            super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        elif self.right:
+
+            yield from super().fragments(args, indent=indent, count=count, pad=pad, **kwargs)
 
         else:
 
-            value = self.VALUE(self.invert)
-            value.generate(indent=indent, count=count, pad=pad, **kwargs)
-            self.sql = value.sql
-            self.args = value.args
+            yield self.VALUE(self.invert), dict(indent=indent, count=count, pad=pad, **kwargs)
+
+class EXISTS(CRITERION):
+    """
+    For EXISTS, with right as the SELECT and no left
+    """
+
+    OPERAND = "EXISTS %s"
+    INVERT = "NOT EXISTS %s"
+
+    __slots__ = ()
+
+    def __init__(self, left=None, right=None, invert=False, jsonify=False, extracted=False, **kwargs):
+
+        if kwargs:
+            left, right = list(kwargs.items())[0]
+
+        if right is None:
+            left, right = None, left
+
+        if left is not None:
+            raise relations_sql.SQLError(self, f"EXISTS takes just a SELECT, not {left}")
+
+        if not isinstance(right, relations_sql.SELECT):
+            raise relations_sql.SQLError(self, f"EXISTS needs a SELECT, not {right}")
+
+        self.left = None
+        self.right = right
+        self.invert = invert
+
+    def __len__(self):
+
+        return 1
+
+    def shape(self, args):
+
+        return (self.__class__, self.invert, self.right.shape(args))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
+        """
+        Generate the SELECT within the operand
+        """
+
+        current = pad * (count * indent)
+        next = current + (indent * pad)
+        line = "\n" if indent else ''
+
+        before, after = self.pieces(self.INVERT if self.invert else self.OPERAND) # pylint: disable=unbalanced-tuple-unpacking
+
+        yield f"{before}({line}{next}"
+        yield self.right, dict(indent=indent, count=count+1, pad=pad, **kwargs)
+        yield f"{line}{current}){after}"
+
 
 class CONTAINS(CRITERION):
     """
@@ -225,6 +433,21 @@ class CONTAINS(CRITERION):
 
     OPERAND = "CONTAINS(%s,%s)"
 
+    __slots__ = ()
+
+
+class OVERLAPS(CRITERION):
+    """
+    Wether one set has any of another
+    """
+
+    LEFT = relations_sql.COLUMN_NAME
+    RIGHT = relations_sql.VALUE
+
+    OPERAND = "OVERLAPS(%s,%s)"
+
+    __slots__ = ()
+
 
 class LENGTHS(CRITERION):
     """
@@ -235,3 +458,5 @@ class LENGTHS(CRITERION):
     RIGHT = relations_sql.VALUE
 
     OPERAND = "LENGTHS(%s,%s)"
+
+    __slots__ = ()
@@ -14,6 +14,9 @@ class DDL(relations_sql.EXPRESSION):
     definition = None
     added = None
 
+    sql = None  # until generated, as definitions keep what's set in a __dict__ rather than slots
+    args = None
+
     def __init__(self, migration=None, definition=None, added=False, **kwargs):
 
         self.migration = migration
@@ -2,7 +2,10 @@
 Module for all Relations SQL Expressions. pieces of criterions, criteria, and statements
 """
 
+import re
 import json
+import weakref
+import functools
 import collections.abc
 
 import relations_sql
@@ -13,6 +16,14 @@ class EXPRESSION(relations_sql.SQL):
     Base class for expressions
     """
 
+    MEMO = False    # whether to remember what was generated until changed, worth it for clauses and queries
+    PARENTS = False # whether to note what remembers this, so changing it has them forget, for what can be changed
+
+    memo = None     # formatting, sql, and args last generated, if remembering
+    parents = None  # weak reference to the nearest expression remembering this one, or weak set if several
+
+    __slots__ = ()
+
     def __len__(self):
 
         return 1
@@ -27,6 +38,21 @@ class EXPRESSION(relations_sql.SQL):
 
         return value
 
+    def shape(self, args):
+        """
+        Hashable structure of the expression, collecting the args along the way
+        """
+
+        raise relations_sql.SQLError(self, f"no shape for {self.__class__.__name__}")
+
+    @staticmethod
+    def shapes(expressions, args):
+        """
+        Shapes of all the expressions that'll be generated
+        """
+
+        return tuple(expression.shape(args) for expression in expressions if expression)
+
     def express(self, expression, sql, **kwargs):
         """
         Add this expression's generation to our own
@@ -40,28 +66,269 @@ class EXPRESSION(relations_sql.SQL):
             sql.append(expression.sql)
             self.args.extend(expression.args)
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def writes(kind):
+        """
+        Whether a class writes fragments, rather than overriding generate
+        """
+
+        for base in kind.__mro__:
+            if "fragments" in base.__dict__:
+                return True
+            if "generate" in base.__dict__:
+                return False
+
+        return False
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def pieces(operand):
+        """
+        Splits a format string into the pieces around its %s's
+        """
+
+        pieces = ['']
+
+        for token in re.split(r"(%%|%s)", operand):
+            if token == "%s":
+                pieces.append('')
+            elif token == "%%":
+                pieces[-1] += '%'
+            else:
+                pieces[-1] += token
+
+        return tuple(pieces)
+
+    @staticmethod
+    def delimit(expressions, delimitter, **kwargs):
+        """
+        Yields the expressions to write, with the delimitter between those that aren't empty
+        """
+
+        first = True
+
+        for expression in expressions:
+            if expression:
+                if not first:
+                    yield delimitter
+                first = False
+            yield expression, kwargs
+
+    def fragments(self, args, **kwargs): # pylint: disable=unused-argument
+        """
+        Yields the sql in pieces, with (expression, kwargs) to be written in place
+        """
+
+        if self.sql:
+            args.extend(self.args or [])
+            yield self.sql
+
+    @staticmethod
+    def formatting(kwargs):
+        """
+        Key for what kwargs generate, leaving out count and pad when not indenting as they don't matter
+        """
+
+        if kwargs.get("indent"):
+            return tuple(kwargs.items())
+
+        return tuple((name, value) for name, value in kwargs.items() if name not in ("count", "pad"))
+
+    def recall(self, formatting, sql, args):
+        """
+        Writes what was last generated, if with the same formatting and unchanged since
+        """
+
+        if self.memo is None or self.memo[0] != formatting:
+            return False
+
+        sql.append(self.memo[1])
+        args.extend(self.memo[2])
+
+        return True
+
+    def remember(self, formatting, sql, args, start, begin):
+        """
+        Remembers what was just generated with this formatting, collapsing it in the buffer, only if MEMO
+        """
+
+        if len(sql) - start != 1:
+            sql[start:] = ["".join(sql[start:])]
+
+        self.memo = (formatting, sql[start], args[begin:]) # pylint: disable=assigning-non-slot
+
+    def remembered(self, keeper):
+        """
+        Notes the nearest expression that remembers what this one wrote, so it forgets if this changes, only if PARENTS
+        """
+
+        parents = self.parents
+
+        if parents is None:
+            self.parents = weakref.ref(keeper) # pylint: disable=assigning-non-slot
+        elif isinstance(parents, weakref.WeakSet):
+            parents.add(keeper)
+        elif parents() is not keeper:
+            self.parents = weakref.ref(keeper) if parents() is None else weakref.WeakSet((parents(), keeper)) # pylint: disable=assigning-non-slot
+
+    def dirty(self):
+        """
+        Forgets what was generated, here and in every expression that remembers this one
+        """
+
+        if self.memo is None and self.parents is None:
+            return
+
+        expressions = [self]
+
+        while expressions:
+
+            expression = expressions.pop()
+            expression.memo = None
+
+            parents, expression.parents = expression.parents, None
+
+            if isinstance(parents, weakref.WeakSet):
+                expressions.extend(parents)
+            elif parents is not None and parents() is not None:
+                expressions.append(parents())
+
+    def write(self, sql, args, **kwargs): # pylint: disable=too-many-branches,too-many-locals
+        """
+        Writes the fragments to a shared sql buffer and args collector, nesting expressions in place
+
+        Uses a stack of fragments rather than recursing so there's no limit to how deep the expressions go,
+        and writes what any expression remembers rather than generating it again
+        """
+
+        formatting = self.formatting(kwargs) if self.MEMO else None
+
+        if self.recall(formatting, sql, args):
+            return
+
+        stack = []
+
+        parent, fragments, start, begin = self, self.fragments(args, **kwargs), len(sql), len(args)
+        keeper = self if formatting is not None else None
+
+        while True:
+
+            for fragment in fragments:
+
+                if isinstance(fragment, str):
+                    sql.append(fragment)
+                    continue
+
+                expression, nested = fragment
+
+                # Note who remembers this so they forget if it changes
+
+                if keeper is not None and isinstance(expression, EXPRESSION) and expression.PARENTS:
+                    expression.remembered(keeper)
+
+                if not expression:
+                    continue
+
+                if not self.writes(expression.__class__):
+
+                    # Can't tell when what's below this changes, so nothing above can remember
+
+                    if isinstance(expression, EXPRESSION):
+                        formatting = keeper = None
+                        for frame in stack:
+                            frame[1] = frame[5] = None
+
+                    expression.generate(**nested)
+                    sql.append(expression.sql)
+                    args.extend(expression.args)
+                    continue
+
+                remembering = self.formatting(nested) if expression.MEMO else None
+
+                if remembering is not None and expression.memo is not None and expression.memo[0] == remembering:
+                    sql.append(expression.memo[1])
+                    args.extend(expression.memo[2])
+                    continue
+
+                stack.append([parent, formatting, start, begin, fragments, keeper])
+
+                parent, formatting, start, begin = expression, remembering, len(sql), len(args)
+                fragments = expression.fragments(args, **nested)
+
+                if remembering is not None:
+                    keeper = expression
+
+                break
+
+            else:
+
+                if formatting is not None:
+                    parent.remember(formatting, sql, args, start, begin)
+
+                if not stack:
+                    return
+
+                parent, formatting, start, begin, fragments, keeper = stack.pop()
+
+    def generate(self, **kwargs):
+        """
+        Generate the sql and args, joining the buffer once
+        """
+
+        sql = []
+        args = []
+        self.write(sql, args, **kwargs)
+        self.sql = "".join(sql)
+        self.args = args
+
 
 class VALUE(EXPRESSION):
     """
     Class for storing a value that will need to be escaped
     """
 
-    value = None # the value
-    jsonify = None # whether this value will be used with JSON
+    __slots__ = (
+        "value",    # the value
+        "jsonify"   # whether this value will be used with JSON
+    )
 
     def __init__(self, value, jsonify=False):
 
         self.value = value
         self.jsonify = jsonify or (value is not None and not isinstance(value, (bool, int, float, str)))
 
-    def generate(self, **kwargs):
+    @staticmethod
+    def dumps(value):
+        """
+        JSON encodes a value, sets sorted so they always encode the same
+        """
+
+        if isinstance(value, set):
+            try:
+                value = sorted(value)
+            except TypeError:
+                value = sorted(value, key=lambda item: (type(item).__name__, repr(item)))
+
+        return json.dumps(value)
+
+    def shape(self, args):
+
+        if self.jsonify:
+            args.append(self.dumps(self.value))
+        else:
+            args.append(self.value)
+
+        return (self.__class__, self.jsonify)
+
+    def fragments(self, args, **kwargs):
 
         if self.jsonify:
-            self.sql = self.JSONIFY % self.PLACEHOLDER
-            self.args = [json.dumps(sorted(list(self.value)) if isinstance(self.value, set) else self.value)]
+            args.append(self.dumps(self.value))
+            yield self.JSONIFY % self.PLACEHOLDER
         else:
-            self.sql = self.PLACEHOLDER
-            self.args = [self.value]
+            args.append(self.value)
+            yield self.PLACEHOLDER
 
 
 class NOT(EXPRESSION):
@@ -71,18 +338,20 @@ class NOT(EXPRESSION):
 
     VALUE = VALUE
 
-    expression = None
+    __slots__ = ("expression",)
 
     def __init__(self, expression):
 
         self.expression = expression if isinstance(expression, relations_sql.SQL) else self.VALUE(expression)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def shape(self, args):
+
+        return (self.__class__, self.expression.shape(args))
 
-        self.args = []
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
 
-        self.express(self.expression, [], indent=indent, count=count+1, pad=pad, **kwargs)
-        self.sql = f"NOT {self.expression.sql}"
+        yield "NOT "
+        yield self.expression, dict(indent=indent, count=count+1, pad=pad, **kwargs)
 
 
 class LIST(EXPRESSION):
@@ -92,12 +361,16 @@ class LIST(EXPRESSION):
 
     ARG = VALUE
 
-    expressions = None
+    __slots__ = ("expressions", "jsonify", "bucket")
 
-    def __init__(self, expressions, jsonify=False):
+    def __init__(self, expressions, jsonify=False, bucket=None):
+
+        if bucket is not None and (not isinstance(bucket, int) or isinstance(bucket, bool) or bucket < 2):
+            raise relations_sql.SQLError(self, f"bucket {bucket} must be an int of 2 or more")
 
         self.expressions = []
         self.jsonify = jsonify
+        self.bucket = bucket
 
         for expression in expressions:
             if isinstance(expression, relations_sql.SQL):
@@ -109,18 +382,158 @@ class LIST(EXPRESSION):
 
         return len(self.expressions)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def padded(self):
+        """
+        Expressions padded to the next power of bucket by repeating the last, if bucketing
+        """
 
-        sql = []
-        self.args = []
+        if not self.bucket or len(self.expressions) < 2:
+            return self.expressions
+
+        size = 1
+
+        while size < len(self.expressions):
+            size *= self.bucket
+
+        return self.expressions + [self.expressions[-1]] * (size - len(self.expressions))
+
+    def shape(self, args):
+
+        return (self.__class__, self.shapes(self.padded(), args))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
 
         current = pad * (count * indent)
         line = "\n" if indent else ''
 
-        for expression in self.expressions:
-            self.express(expression, sql, indent=indent, count=count+1, pad=pad, **kwargs)
+        yield from self.delimit(self.padded(), f",{line}{current}", indent=indent, count=count+1, pad=pad, **kwargs)
 
-        self.sql = f",{line}{current}".join(sql)
+
+class ROWS(EXPRESSION):
+    """
+    Holds rows of values for VALUES, only making expressions of values that need them
+    """
+
+    ARG = VALUE
+
+    __slots__ = (
+        "rows",     # tuples of values, each the same length
+        "mixed"     # indexes of rows having expressions
+    )
+
+    def __init__(self, rows):
+
+        self.rows = []
+        self.mixed = set()
+
+        for row in rows:
+
+            if isinstance(row, (dict, str, bytes)):
+                raise relations_sql.SQLError(self, f"row {row} must be a list or tuple of values")
+
+            row = tuple(row)
+
+            if self.rows and len(row) != len(self.rows[0]):
+                raise relations_sql.SQLError(self, f"wrong values {row} for width {len(self.rows[0])}")
+
+            for value in row:
+                if value is not None and not isinstance(value, (bool, int, float, str)):
+                    self.mixed.add(len(self.rows))
+                    row = tuple(
+                        value if value is None or isinstance(value, (bool, int, float, str, relations_sql.SQL))
+                        else self.ARG(value) for value in row
+                    )
+                    break
+
+            self.rows.append(row)
+
+    def __len__(self):
+
+        return len(self.rows)
+
+    def slice(self, start, end):
+        """
+        Rows from start to end, without checking them again
+        """
+
+        rows = self.__class__([])
+        rows.rows = self.rows[start:end]
+        rows.mixed = {index - start for index in self.mixed if start <= index < end}
+
+        return rows
+
+    def row(self, index, args):
+        """
+        Shape of a row having expressions, if it does, collecting its args along the way
+        """
+
+        if index not in self.mixed:
+            args.extend(self.rows[index])
+            return None
+
+        shape = []
+
+        for value in self.rows[index]:
+            if isinstance(value, relations_sql.SQL):
+                shape.append(value.shape(args))
+            else:
+                args.append(value)
+                shape.append(None)
+
+        return tuple(shape)
+
+    def shape(self, args):
+
+        shapes = []
+
+        for index in range(len(self.rows)):
+            shape = self.row(index, args)
+            if shape is not None:
+                shapes.append((index, shape))
+
+        return (self.__class__, len(self.rows), len(self.rows[0]), tuple(shapes))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs): # pylint: disable=too-many-locals
+        """
+        Writes runs of plain rows all at once, between the parentheses VALUES opens and closes
+        """
+
+        current = pad * (count * indent)
+        before = pad * ((count - 1) * indent)
+        line = "\n" if indent else ''
+
+        delimitter = f",{line}{current}"
+        between = f"{line}{before}),({line}{current}"
+        grid = delimitter.join([self.PLACEHOLDER] * len(self.rows[0]))
+
+        nested = dict(indent=indent, count=count+1, pad=pad, **kwargs)
+        start = None
+
+        for index, row in enumerate(self.rows):
+
+            if index not in self.mixed:
+                args.extend(row)
+                if start is None:
+                    start = index
+                continue
+
+            if start is not None:
+                yield (between if start else '') + between.join([grid] * (index - start)) + between
+                start = None
+            elif index:
+                yield between
+
+            for place, value in enumerate(row):
+                if place:
+                    yield delimitter
+                if isinstance(value, relations_sql.SQL):
+                    yield value, nested
+                else:
+                    args.append(value)
+                    yield self.PLACEHOLDER
+
+        if start is not None:
+            yield (between if start else '') + between.join([grid] * (len(self.rows) - start))
 
 
 class NAME(EXPRESSION):
@@ -128,10 +541,13 @@ class NAME(EXPRESSION):
     For anything that needs to be quote
     """
 
-    name = None
+    PARENTS = True
+
+    __slots__ = ("name", "parents")
 
     def __init__(self, name):
 
+        self.parents = None
         self(name)
 
     def __len__(self):
@@ -146,12 +562,16 @@ class NAME(EXPRESSION):
         """
         Set the NAME explicitly
         """
+        self.dirty()
         self.name = name
 
-    def generate(self, **kwargs):
+    def shape(self, args):
 
-        self.sql = self.quote(self.name)
-        self.args = []
+        return (self.__class__, self.name)
+
+    def fragments(self, args, **kwargs):
+
+        yield self.quote(self.name)
 
 
 class SCHEMA_NAME(NAME):
@@ -159,6 +579,8 @@ class SCHEMA_NAME(NAME):
     For schemas
     """
 
+    __slots__ = ()
+
 
 class TABLE_NAME(SCHEMA_NAME):
     """
@@ -167,12 +589,12 @@ class TABLE_NAME(SCHEMA_NAME):
 
     SCHEMA_NAME = SCHEMA_NAME
 
-    schema = None
-
-    prefix = None
+    __slots__ = ("schema", "prefix")
 
     def __init__(self, name, schema=None, prefix=None):
 
+        self.parents = None
+        self.schema = None
         self(name, schema, prefix)
 
     def __call__(self, name, schema=None, prefix=None):
@@ -181,6 +603,8 @@ class TABLE_NAME(SCHEMA_NAME):
 
     def set(self, name, schema=None, prefix=None):
 
+        self.dirty()
+
         pieces = name.split(self.SEPARATOR)
 
         self.name = pieces.pop(-1)
@@ -192,17 +616,11 @@ class TABLE_NAME(SCHEMA_NAME):
 
         self.prefix = prefix
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
-
-        sql = []
-        self.args = []
-
-        if self.schema:
-            self.express(self.schema, sql, **kwargs)
+    def shape(self, args):
 
-        sql.append(self.quote(self.name))
+        return (self.__class__, self.schema.shape(args) if self.schema else None, self.name, self.prefix)
 
-        self.sql = self.SEPARATOR.join(sql)
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
 
         one = pad * indent
         current = pad * (count * indent)
@@ -210,7 +628,13 @@ class TABLE_NAME(SCHEMA_NAME):
         line = "\n" if indent else ' '
 
         if self.prefix is not None:
-            self.sql = f"{self.prefix}{line}{next}{self.sql}" if self.prefix else f"{one}{self.sql}"
+            yield f"{self.prefix}{line}{next}" if self.prefix else one
+
+        if self.schema:
+            yield self.schema, kwargs
+            yield self.SEPARATOR
+
+        yield self.quote(self.name)
 
 
 class COLUMN_NAME(TABLE_NAME):
@@ -220,13 +644,21 @@ class COLUMN_NAME(TABLE_NAME):
 
     TABLE_NAME = TABLE_NAME
 
-    table = None  # name of the table
+    PATHS = relations_sql.CACHE(size=4096) # name, path, and walked path by class and column
 
-    jsonify = None # whether we need to cast this column as JSON
-    path = None     # path to use in the JSON
+    __slots__ = (
+        "table",    # name of the table
+        "jsonify",  # whether we need to cast this column as JSON
+        "path",     # path to use in the JSON
+        "walked"    # path as the dialect walks it
+    )
 
     def __init__(self, name, table=None, schema=None, jsonify=False, extracted=False):
 
+        self.parents = None
+        self.schema = None
+        self.prefix = None
+        self.table = None
         self(name, table, schema, jsonify, extracted)
 
     def __call__(self, name, table=None, schema=None, jsonify=False, extracted=False):
@@ -235,9 +667,11 @@ class COLUMN_NAME(TABLE_NAME):
 
     def set(self, name, table=None, schema=None, jsonify=False, extracted=False):
 
+        self.dirty()
+
         pieces = name.split(self.SEPARATOR)
 
-        self.name, self.path = self.split(pieces.pop(-1)) if not extracted else (pieces.pop(-1), [])
+        self.name, self.path, self.walked = self.parse(pieces.pop(-1)) if not extracted else (pieces.pop(-1), [], None)
 
         if pieces:
             piece = pieces.pop(-1)
@@ -254,6 +688,24 @@ class COLUMN_NAME(TABLE_NAME):
 
         self.jsonify = jsonify
 
+    def parse(self, column):
+        """
+        Splits the column into name, path, and walked path, remembering it in PATHS
+        """
+
+        # Plain names have no path, unless they're numbers overscore would make an int
+
+        if '__' not in column and column[:1] not in "_0123456789":
+            return column, [], None
+
+        parsed = self.PATHS.get((self.__class__, column))
+
+        if parsed is None:
+            name, path = self.split(column)
+            parsed = self.PATHS.set((self.__class__, column), (name, tuple(path), self.walk(path) if path else None))
+
+        return parsed[0], list(parsed[1]), parsed[2]
+
     def column(self, **kwargs):
         """
         Generates the column with table and schema
@@ -268,23 +720,39 @@ class COLUMN_NAME(TABLE_NAME):
 
         return self.SEPARATOR.join(sql)
 
-    def generate(self, **kwargs):
+    def shape(self, args):
+
+        table = self.table.shape(args) if self.table else None
+
+        if self.path:
+            args.append(self.walked)
+
+        return (self.__class__, table, self.name, tuple(self.path), self.jsonify)
+
+    def fragments(self, args, **kwargs):
         """
         Generates the sql and args
         """
 
-        self.args = []
+        before, after = self.pieces(self.JSONIFY) if self.jsonify else ('', '')
 
-        column = self.column(**kwargs)
+        if self.path:
+            path, middle, end = self.pieces(self.PATH) # pylint: disable=unbalanced-tuple-unpacking
+            before = f"{before}{path}"
+            after = f"{middle}{self.PLACEHOLDER}{end}{after}"
+
+        yield before
+
+        if self.table:
+            yield self.table, kwargs
+            yield self.SEPARATOR
+
+        yield '*' if self.name == '*' else self.quote(self.name)
 
         if self.path:
-            self.sql = self.PATH % (column, self.PLACEHOLDER)
-            self.args.append(self.walk(self.path))
-        else:
-            self.sql = column
+            args.append(self.walked)
 
-        if self.jsonify:
-            self.sql = self.JSONIFY % self.sql
+        yield after
 
 
 class NAMES(LIST):
@@ -294,9 +762,12 @@ class NAMES(LIST):
 
     ARG = NAME
 
+    __slots__ = ()
+
     def __init__(self, expressions):
 
         self.expressions = []
+        self.bucket = None
 
         for expression in expressions:
             if isinstance(expression, relations_sql.SQL):
@@ -312,9 +783,12 @@ class COLUMN_NAMES(NAMES):
 
     ARG = COLUMN_NAME
 
+    __slots__ = ()
+
     def __init__(self, expressions):
 
         self.expressions = []
+        self.bucket = None
 
         for expression in expressions:
             if isinstance(expression, relations_sql.SQL):
@@ -322,7 +796,7 @@ class COLUMN_NAMES(NAMES):
             else:
                 self.expressions.append(self.ARG(expression, extracted=True))
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
         """
         Generates the sql and args
         """
@@ -336,11 +810,9 @@ class COLUMN_NAMES(NAMES):
         delimitter = f",{line}{next}"
         left, right = (f"{one}({line}{next}", f"{line}{current})")
 
-        sql = []
-        self.args = []
-
-        self.express(self.expressions, sql, indent=indent, count=count+1, pad=' ', **kwargs)
-        self.sql = f"{left}{delimitter.join(sql)}{right}"
+        yield left
+        yield from self.delimit(self.expressions, delimitter, indent=indent, count=count+1, pad=' ', **kwargs)
+        yield right
 
 
 class AS(EXPRESSION):
@@ -350,8 +822,7 @@ class AS(EXPRESSION):
 
     NAME = NAME
 
-    label = None
-    expression = None
+    __slots__ = ("label", "expression")
 
     def __init__(self, label, expression):
 
@@ -362,23 +833,79 @@ class AS(EXPRESSION):
 
         return len(self.label) + len(self.expression)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def shape(self, args):
+
+        return (self.__class__, self.shapes([self.expression, self.label], args))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
         """
         Generates the sql and args
         """
 
-        sql = []
-        self.args = []
-
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ''
         left, right = (f"({line}{next}", f"{line}{current})") if isinstance(self.expression, relations_sql.SELECT) else ('', '')
 
-        self.express(self.expression, sql, indent=indent, count=count+1, **kwargs)
-        self.express(self.label, sql, indent=indent, count=count+1, **kwargs)
+        nested = dict(indent=indent, count=count+1, **kwargs)
+
+        yield left
+        yield self.expression, nested
+        yield f"{right} AS "
+        yield self.label, nested
+
+
+class CTE(EXPRESSION):
+    """
+    For named queries in WITH
+    """
+
+    NAME = NAME
+
+    OPERAND = "%s AS %s"
+    MATERIALIZED = None     # OPERAND to use if materialized (if any)
+    NOT_MATERIALIZED = None # OPERAND to use if not materialized (if any)
 
-        self.sql = f"{left}{sql[0]}{right} AS {sql[1]}"
+    __slots__ = ("label", "expression", "materialized")
+
+    def __init__(self, label, expression, materialized=None):
+
+        if materialized is not None and (self.MATERIALIZED if materialized else self.NOT_MATERIALIZED) is None:
+            raise relations_sql.SQLError(self, "no materialized without MATERIALIZED operand")
+
+        self.label = label if isinstance(label, relations_sql.SQL) else self.NAME(label)
+        self.expression = expression
+        self.materialized = materialized
+
+    def __len__(self):
+
+        return len(self.label) + len(self.expression)
+
+    def shape(self, args):
+
+        return (self.__class__, self.materialized, self.shapes([self.label, self.expression], args))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
+        """
+        Generates the sql and args
+        """
+
+        current = pad * (count * indent)
+        next = current + (indent * pad)
+        line = "\n" if indent else ''
+
+        if self.materialized is None:
+            before, middle, after = self.pieces(self.OPERAND) # pylint: disable=unbalanced-tuple-unpacking
+        else:
+            before, middle, after = self.pieces(self.MATERIALIZED if self.materialized else self.NOT_MATERIALIZED) # pylint: disable=unbalanced-tuple-unpacking
+
+        nested = dict(indent=indent, count=count+1, **kwargs)
+
+        yield before
+        yield self.label, nested
+        yield f"{middle}({line}{next}"
+        yield self.expression, nested
+        yield f"{line}{current}){after}"
 
 
 ASC = -1
@@ -391,8 +918,7 @@ class ORDER(EXPRESSION):
 
     EXPRESSION = COLUMN_NAME
 
-    expression = None
-    order = None
+    __slots__ = ("expression", "order")
 
     ORDER = {
         ASC: "ASC",
@@ -416,17 +942,16 @@ class ORDER(EXPRESSION):
 
         return len(self.expression)
 
-    def generate(self, **kwargs):
+    def shape(self, args):
 
-        sql = []
-        self.args = []
+        return (self.__class__, self.shapes([self.expression], args), self.order)
+
+    def fragments(self, args, **kwargs):
 
         if self.expression:
-            self.express(self.expression, sql, **kwargs)
+            yield self.expression, kwargs
             if self.ORDER.get(self.order) is not None:
-                sql.append(self.ORDER[self.order])
-
-        self.sql = " ".join(sql)
+                yield f" {self.ORDER[self.order]}"
 
 
 class ASSIGN(EXPRESSION):
@@ -437,8 +962,7 @@ class ASSIGN(EXPRESSION):
     COLUMN_NAME = COLUMN_NAME
     EXPRESSION = VALUE
 
-    column = None
-    expression = None
+    __slots__ = ("column", "expression")
 
     def __init__(self, column, expression):
 
@@ -449,20 +973,23 @@ class ASSIGN(EXPRESSION):
 
         return len(self.column) + len(self.expression)
 
-    def generate(self, indent=0, count=0, pad=' ', **kwargs):
+    def shape(self, args):
+
+        return (self.__class__, self.shapes([self.column, self.expression], args))
+
+    def fragments(self, args, indent=0, count=0, pad=' ', **kwargs):
         """
         Generates the sql and args
         """
 
-        sql = []
-        self.args = []
-
         current = pad * (count * indent)
         next = current + (indent * pad)
         line = "\n" if indent else ''
         left, right = (f"({line}{next}", f"{line}{current})") if isinstance(self.expression, relations_sql.SELECT) else ('', '')
 
-        self.express(self.column, sql, indent=indent, count=count+1, **kwargs)
-        self.express(self.expression, sql, indent=indent, count=count+1, **kwargs)
+        nested = dict(indent=indent, count=count+1, **kwargs)
 
-        self.sql = f"{sql[0]}={left}{sql[1]}{right}"
+        yield self.column, nested
+        yield f"={left}"
+        yield self.expression, nested
+        yield right
@@ -17,6 +17,14 @@ class QUERY(relations_sql.EXPRESSION):
     CLAUSES = None
     clauses = None
 
+    STATEMENTS = None # CACHE of sql by shape, if any
+
+    MEMO = True
+    PARENTS = True
+
+    sql = None  # until generated, as queries keep what's set in a __dict__ rather than slots
+    args = None
+
     model = None
 
     def __init__(self, **kwargs):
@@ -48,6 +56,7 @@ class QUERY(relations_sql.EXPRESSION):
         """
 
         if name in self.CLAUSES:
+            self.dirty()
             self.clauses[name] = value
         else:
             object.__setattr__(self, name, value)
@@ -72,6 +81,7 @@ class QUERY(relations_sql.EXPRESSION):
         Binds the model
         """
 
+        self.dirty()
         self.model = model
         return self
 
@@ -117,20 +127,63 @@ class QUERY(relations_sql.EXPRESSION):
 
         self.model.delete(query=self, *args, **kwargs)
 
+    def shape(self, args):
+
+        return (self.__class__, self.shapes(self.clauses.values(), args))
+
+    def key(self, args, indent=0, count=0, pad=" ", **kwargs):
+        """
+        Key for STATEMENTS from the shape, collecting the args along the way
+        """
+
+        if self.STATEMENTS is None or kwargs:
+            return None
+
+        try:
+            return (indent, count, pad, self.shape(args))
+        except (relations_sql.SQLError, RecursionError):
+            return None
+
     def generate(self, indent=0, count=0, pad=" ", **kwargs):
         """
         Generate the sql and args
         """
 
-        sql = []
-        self.args = []
+        args = []
+        key = self.key(args, indent=indent, count=count, pad=pad, **kwargs)
+
+        if key is not None:
+            sql = self.STATEMENTS.get(key)
+            if sql is not None:
+                self.sql = sql
+                self.args = args
+                return
+
+        super().generate(indent=indent, count=count, pad=pad, **kwargs)
+
+        if key is not None:
+            self.STATEMENTS.set(key, self.sql)
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
+        """
+        Generate the sql and args
+        """
 
         current = pad * (count * indent)
         line = "\n" if indent else ' '
         delimitter = f"{line}{current}"
 
-        self.express(self.clauses.values(), sql, indent=indent, count=count, pad=" ", **kwargs)
-        self.sql = f"{self.NAME}{line}{current}{delimitter.join(sql)}"
+        # WITH goes before the query itself
+
+        if "WITH" in self.clauses:
+            yield self.clauses["WITH"], dict(indent=indent, count=count, pad=" ", **kwargs)
+            if self.clauses["WITH"]:
+                yield delimitter
+
+        clauses = [clause for name, clause in self.clauses.items() if name != "WITH"]
+
+        yield f"{self.NAME}{line}{current}"
+        yield from self.delimit(clauses, delimitter, indent=indent, count=count, pad=" ", **kwargs)
 
 
 class SELECT(QUERY):
@@ -141,9 +194,11 @@ class SELECT(QUERY):
     NAME = "SELECT"
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", relations_sql.WITH),
         ("OPTIONS", relations_sql.OPTIONS),
         ("FIELDS", relations_sql.FIELDS),
         ("FROM", relations_sql.FROM),
+        ("JOINS", relations_sql.JOINS),
         ("WHERE", relations_sql.WHERE),
         ("GROUP_BY", relations_sql.GROUP_BY),
         ("HAVING", relations_sql.HAVING),
@@ -151,6 +206,17 @@ class SELECT(QUERY):
         ("LIMIT", relations_sql.LIMIT)
     ])
 
+    AND = relations_sql.AND
+    OR = relations_sql.OR
+    EQ = relations_sql.EQ
+    GT = relations_sql.GT
+    LT = relations_sql.LT
+
+    COUNT = "COUNT(*)" # what to select as count when counting
+
+    seeking = None
+    chunked = None
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(**{key: value for key, value in kwargs.items() if key in self.CLAUSES})
@@ -162,6 +228,218 @@ class SELECT(QUERY):
         """
         return self.FIELDS(*args, **kwargs)
 
+    def join(self, kind, TABLE, *args, **kwargs): # pylint: disable=invalid-name
+        """
+        Adds a JOIN of the kind given to JOINS
+        """
+
+        self.JOINS.add(getattr(self.JOINS, kind)(TABLE, *args, **kwargs))
+
+        return self
+
+    def JOIN(self, TABLE, *args, **kwargs): # pylint: disable=invalid-name
+        """
+        Adds a JOIN, of a table ON criteria
+        """
+        return self.join("JOIN", TABLE, *args, **kwargs)
+
+    def LEFT_JOIN(self, TABLE, *args, **kwargs): # pylint: disable=invalid-name
+        """
+        Adds a LEFT JOIN, of a table ON criteria
+        """
+        return self.join("LEFT_JOIN", TABLE, *args, **kwargs)
+
+    def RIGHT_JOIN(self, TABLE, *args, **kwargs): # pylint: disable=invalid-name
+        """
+        Adds a RIGHT JOIN, of a table ON criteria
+        """
+        return self.join("RIGHT_JOIN", TABLE, *args, **kwargs)
+
+    def FULL_JOIN(self, TABLE, *args, **kwargs): # pylint: disable=invalid-name
+        """
+        Adds a FULL JOIN, of a table ON criteria
+        """
+        return self.join("FULL_JOIN", TABLE, *args, **kwargs)
+
+    def CROSS_JOIN(self, TABLE, *args, **kwargs): # pylint: disable=invalid-name
+        """
+        Adds a CROSS JOIN, of a table
+        """
+        return self.join("CROSS_JOIN", TABLE, *args, **kwargs)
+
+    def counted(self, cap=None):
+        """
+        Query counting the rows this one would select, without ordering, fields, or limit,
+        selecting from this one without ordering or limit when grouped or distinct,
+        and only up to one more than cap if capped, so more than cap means at least that many,
+        counting every row rather than those after the seek if seeking
+        """
+
+        clauses = dict(self.clauses)
+
+        if self.seeking is not None:
+            clauses["WHERE"] = self.CLAUSES["WHERE"]([
+                expression for expression in self.WHERE.expressions if expression is not self.seeking
+            ])
+
+        query = self.__class__()
+        query.FIELDS(count=relations_sql.SQL(self.COUNT))
+
+        distinct = False
+
+        for option in self.OPTIONS.expressions:
+            option.generate()
+            distinct = distinct or "DISTINCT" in (option.sql or '').upper()
+
+        grouped = bool(self.GROUP_BY or self.HAVING or distinct)
+        dropped = ["ORDER_BY", "LIMIT"] + ([] if grouped else ["OPTIONS", "FIELDS", "GROUP_BY", "HAVING"])
+
+        if grouped or cap is not None:
+
+            inner = self.__class__()
+
+            for clause in self.CLAUSES:
+                if clause not in dropped:
+                    setattr(query if clause == "WITH" else inner, clause, clauses[clause])
+
+            if not grouped:
+                inner.FIELDS(relations_sql.SQL("1"))
+
+            if cap is not None:
+                inner.LIMIT(cap + 1)
+
+            query.FROM(counted=inner)
+
+        else:
+
+            for clause in self.CLAUSES:
+                if clause not in dropped:
+                    setattr(query, clause, clauses[clause])
+
+        return query
+
+    def seek(self, last, total=None):
+        """
+        Only what comes after the last row by ORDER_BY, instead of an offset, replacing any previous seek,
+        with last the values of the ORDER_BY expressions as a list or a dict by column name,
+        dropping any offset, and setting the LIMIT total if given
+        """
+
+        orders = self.ORDER_BY.expressions
+
+        if not orders:
+            raise relations_sql.SQLError(self, "need ORDER_BY to seek")
+
+        for order in orders:
+            if not isinstance(order, relations_sql.ORDER):
+                raise relations_sql.SQLError(self, f"can only seek on ORDER, not {order}")
+
+        if isinstance(last, dict):
+
+            values = []
+
+            for order in orders:
+                name = getattr(order.expression, "name", None)
+                if name not in last:
+                    raise relations_sql.SQLError(self, f"missing {name} in {last}")
+                values.append(last[name])
+
+        else:
+
+            values = list(last)
+
+            if len(values) != len(orders):
+                raise relations_sql.SQLError(self, f"need {len(orders)} values to seek, not {values}")
+
+        # After is beyond on the first, or the same on the first and beyond on the second, and so on
+
+        afters = []
+
+        for index, (order, value) in enumerate(zip(orders, values)):
+            beyond = self.LT if order.order == relations_sql.DESC else self.GT
+            sames = [self.EQ(before.expression, before_value) for before, before_value in zip(orders[:index], values[:index])]
+            afters.append(self.AND(*sames, beyond(order.expression, value)) if sames else beyond(order.expression, value))
+
+        self.unseek()
+
+        self.WHERE.dirty()
+        self.seeking = self.OR(*afters) if len(afters) > 1 else afters[0]
+        self.WHERE.expressions.append(self.seeking)
+
+        if total is not None:
+            self.LIMIT.dirty()
+            self.LIMIT.expressions = []
+            self.LIMIT.add(total)
+        elif len(self.LIMIT.expressions) > 1:
+            self.LIMIT.dirty()
+            self.LIMIT.expressions = self.LIMIT.expressions[:1]
+
+        return self
+
+    def unseek(self):
+        """
+        Removes the last seek, if any
+        """
+
+        if self.seeking is not None:
+            self.WHERE.dirty()
+            self.WHERE.expressions = [expression for expression in self.WHERE.expressions if expression is not self.seeking]
+            self.seeking = None
+
+        return self
+
+    def chunks(self, key, size, fetch=None):
+        """
+        Yields each chunk of up to size rows ordered by the unique key (or keys), seeking past the last row of the one before
+
+        With fetch, it's called with this query for each chunk's rows, which are yielded till there's fewer than size.
+        Without, this query is yielded for each chunk and the last row it got is sent back for the next, till None is.
+        Rows are dicts by column name and the chunks and rows so far are kept in chunked.
+        """
+
+        keys = [key] if isinstance(key, str) else list(key)
+        names = [getattr(order.expression, "name", None) for order in self.ORDER_BY.expressions]
+
+        for name in keys:
+            if name not in names:
+                self.ORDER_BY(name)
+
+        self.unseek()
+
+        self.LIMIT.dirty()
+        self.LIMIT.expressions = []
+        self.LIMIT.add(size)
+
+        self.chunked = {"size": size, "chunks": 0, "rows": 0}
+
+        while True:
+
+            if fetch is not None:
+
+                rows = fetch(self)
+
+                self.chunked["chunks"] += 1
+                self.chunked["rows"] += len(rows)
+
+                if rows:
+                    yield rows
+
+                if len(rows) < size:
+                    return
+
+                last = rows[-1]
+
+            else:
+
+                self.chunked["chunks"] += 1
+
+                last = yield self
+
+                if last is None:
+                    return
+
+            self.seek(last)
+
 
 class INSERT(QUERY):
     """
@@ -171,7 +449,12 @@ class INSERT(QUERY):
     NAME = "INSERT"
     PREFIX = "INTO"
 
+    CHUNK_ROWS = None           # most rows in a statement when chunking, if any
+    CHUNK_PLACEHOLDERS = None   # most placeholders in a statement when chunking, if any
+    CHUNK_PAYLOAD = None        # most estimated bytes in a statement when chunking, if any
+
     CLAUSES = collections.OrderedDict([
+        ("WITH", relations_sql.WITH),
         ("OPTIONS", relations_sql.OPTIONS),
         ("TABLE", relations_sql.TABLE_NAME),
         ("COLUMNS", relations_sql.COLUMN_NAMES),
@@ -181,6 +464,8 @@ class INSERT(QUERY):
 
     def __init__(self, TABLE, *args, **kwargs): # pylint: disable=too-many-branches
 
+        rows = kwargs.pop("ROWS", None)
+
         if args:
             kwargs["COLUMNS"] = [arg for arg in args if not isinstance(arg, dict)]
             args = [arg for arg in args if isinstance(arg, dict)]
@@ -195,6 +480,7 @@ class INSERT(QUERY):
                 if isinstance(TABLE, self.CLAUSES["TABLE"]):
                     self.clauses[clause] = TABLE
                     self.clauses[clause].prefix = self.PREFIX
+                    TABLE.dirty()
                 else:
                     self.clauses[clause] = self.CLAUSES[clause](TABLE, prefix=self.PREFIX)
             elif clause == "COLUMNS":
@@ -225,6 +511,9 @@ class INSERT(QUERY):
                 else:
                     self.clauses[clause] = self.CLAUSES[clause]().bind(self)
 
+        if rows is not None:
+            self.VALUES(ROWS=rows)
+
     def column(self, columns):
         """
         Field the columns
@@ -235,7 +524,235 @@ class INSERT(QUERY):
 
         self.COLUMNS = self.CLAUSES["COLUMNS"](columns)
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def head(self, indent=0, count=0, pad=" "):
+        """
+        Generates the sql and args of everything before VALUES
+        """
+
+        current = pad * (count * indent)
+        line = "\n" if indent else ' '
+        delimitter = f"{line}{current}"
+
+        before = ''
+        sql = []
+        args = []
+
+        for clause in self.clauses:
+
+            if clause == "VALUES":
+                break
+
+            if self.clauses[clause]:
+                self.clauses[clause].generate(indent=indent, count=count, pad=" ")
+                if clause == "WITH":
+                    before = f"{self.clauses[clause].sql}{delimitter}"
+                else:
+                    sql.append(self.clauses[clause].sql)
+                args.extend(self.clauses[clause].args)
+
+        return f"{before}{self.NAME}{line}{current}{delimitter.join(sql)}{delimitter}", args
+
+    def chunks(self, rows=None, placeholders=None, payload=None, indent=0, count=0, pad=" "):
+        """
+        Yields the sql and args as statements, each within the most rows, placeholders,
+        and estimated bytes, defaulting to the CHUNK's
+        """
+
+        if not self.VALUES:
+            self.generate(indent=indent, count=count, pad=pad)
+            yield self.sql, self.args
+            return
+
+        if self.SELECT:
+            raise relations_sql.SQLError(self, "set VALUES or SELECT but not both")
+
+        rows = rows or self.CHUNK_ROWS
+        placeholders = placeholders or self.CHUNK_PLACEHOLDERS
+        payload = payload or self.CHUNK_PAYLOAD
+
+        head, args = self.head(indent=indent, count=count, pad=pad)
+
+        for batch in self.VALUES.batches(rows, placeholders, payload, len(args), len(head) + self.VALUES.size(args)):
+            values = self.CLAUSES["VALUES"]()
+            values.expressions = batch
+            values.generate(indent=indent, count=count, pad=" ")
+            yield f"{head}{values.sql}", args + values.args
+
+    def stream(self, values, rows=None, placeholders=None, payload=None, indent=0, count=0, pad=" "): # pylint: disable=too-many-locals
+        """
+        Yields the sql and args as statements for rows, dicts or lists, from an iterable,
+        only holding a statement's worth at a time, after any already in VALUES
+        """
+
+        if self.SELECT:
+            raise relations_sql.SQLError(self, "set VALUES or SELECT but not both")
+
+        rows = rows or self.CHUNK_ROWS
+        placeholders = placeholders or self.CHUNK_PLACEHOLDERS
+        payload = payload or self.CHUNK_PAYLOAD
+
+        if not (rows or placeholders or payload):
+            raise relations_sql.SQLError(self, "need most rows, placeholders, or payload to stream")
+
+        if self.VALUES:
+            yield from self.chunks(rows, placeholders, payload, indent=indent, count=count, pad=pad)
+
+        if self.COLUMNS:
+            self.VALUES.column(None)
+
+        head = None
+        batch = []
+
+        for row in values:
+
+            if isinstance(row, dict):
+                row = self.VALUES.order(row)
+
+            if head is None:
+                head, args = self.head(indent=indent, count=count, pad=pad)
+                used, sized = len(args), len(head) + self.VALUES.size(args)
+                places, total = used, sized
+
+            size = self.VALUES.size(row) if payload else 0
+
+            if batch and (
+                (placeholders and places + len(row) > placeholders) or
+                (payload and total + size > payload)
+            ):
+                yield self.streamed(head, args, batch, indent=indent, count=count)
+                batch = []
+                places, total = used, sized
+
+            batch.append(row)
+            places += len(row)
+            total += size
+
+            # Sent as soon as full so the next row isn't read until needed
+
+            if rows and len(batch) >= rows:
+                yield self.streamed(head, args, batch, indent=indent, count=count)
+                batch = []
+                places, total = used, sized
+
+        if batch:
+            yield self.streamed(head, args, batch, indent=indent, count=count)
+
+    def streamed(self, head, args, batch, indent=0, count=0):
+        """
+        Generates a statement for a batch of rows being streamed
+        """
+
+        values = self.CLAUSES["VALUES"]()
+        values.columns = self.VALUES.columns
+        values.rows(batch)
+        values.generate(indent=indent, count=count, pad=" ")
+
+        return f"{head}{values.sql}", args + values.args
+
+    def jsons(self):
+        """
+        Places of the columns any row has JSON in
+        """
+
+        jsons = set()
+
+        for expression in self.VALUES.expressions:
+
+            if isinstance(expression, relations_sql.ROWS):
+                rows = [expression.rows[index] for index in expression.mixed]
+            elif isinstance(expression, relations_sql.LIST):
+                rows = [expression.expressions]
+            else:
+                continue
+
+            for row in rows:
+                jsons.update(place for place, value in enumerate(row) if isinstance(value, relations_sql.VALUE) and value.jsonify)
+
+        return jsons
+
+    def wrapped(self, expression, index, jsons):
+        """
+        A row with None in JSON columns wrapped in JSON, to bind as NULL, if there were any
+        """
+
+        if isinstance(expression, relations_sql.ROWS):
+            row = expression.rows[index]
+        elif isinstance(expression, relations_sql.LIST):
+            row = expression.expressions
+        else:
+            return None
+
+        arg = self.VALUES.ARGS.ARG
+
+        wrapped = list(row)
+        changed = False
+
+        for place in jsons:
+
+            if place >= len(row):
+                continue
+
+            value = row[place]
+
+            if isinstance(value, relations_sql.VALUE) and not value.jsonify:
+                value = value.value
+
+            if value is None:
+                wrapped[place] = relations_sql.SQL(arg.JSONIFY % arg.PLACEHOLDER, [None])
+                changed = True
+
+        return self.VALUES.ARGS(wrapped) if changed else None
+
+    def many(self, indent=0, count=0, pad=" "): # pylint: disable=too-many-locals
+        """
+        Generates the sql for a single row and the args of each row, for executemany,
+        wrapping None in JSON in each column any row has JSON in
+        """
+
+        if not self.VALUES:
+            raise relations_sql.SQLError(self, "need VALUES for many")
+
+        if self.SELECT:
+            raise relations_sql.SQLError(self, "set VALUES or SELECT but not both")
+
+        head, args = self.head(indent=indent, count=count, pad=pad)
+
+        sql = None
+        rows = []
+        plain = {}
+        jsons = self.jsons()
+
+        for expression, index, values in self.VALUES.each():
+
+            wrapped = self.wrapped(expression, index, jsons) if jsons else None
+
+            if (
+                wrapped is None and index is not None and index not in expression.mixed and
+                (expression.__class__, len(values)) in plain
+            ):
+                row = plain[(expression.__class__, len(values))]
+            else:
+                single = self.CLAUSES["VALUES"]()
+                if wrapped is not None:
+                    single.expressions = [wrapped]
+                else:
+                    single.expressions = [expression if index is None else expression.slice(index, index + 1)]
+                single.generate(indent=indent, count=count, pad=" ")
+                row = single.sql
+                values = single.args
+                if wrapped is None and index is not None and index not in expression.mixed:
+                    plain[(expression.__class__, len(values))] = row
+
+            if sql is None:
+                sql = row
+            elif row != sql:
+                raise relations_sql.SQLError(self, f"row {row} differs from {sql} for many")
+
+            rows.append(tuple(args) + tuple(values))
+
+        return f"{head}{sql}", rows
+
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
         """
         Generate the sql and args
         """
@@ -243,7 +760,7 @@ class INSERT(QUERY):
         if self.VALUES and self.SELECT:
             raise relations_sql.SQLError(self, "set VALUES or SELECT but not both")
 
-        super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        yield from super().fragments(args, indent=indent, count=count, pad=pad, **kwargs)
 
 
 class LIMITED(QUERY):
@@ -261,6 +778,7 @@ class LIMITED(QUERY):
                     self.clauses[clause] = TABLE
                     if self.PREFIX:
                         TABLE.prefix = self.PREFIX
+                        TABLE.dirty()
                 else:
                     self.clauses[clause] = self.CLAUSES[clause](TABLE, prefix=self.PREFIX)
             else:
@@ -272,7 +790,7 @@ class LIMITED(QUERY):
                 else:
                     self.clauses[clause] = self.CLAUSES[clause]().bind(self)
 
-    def generate(self, indent=0, count=0, pad=" ", **kwargs):
+    def fragments(self, args, indent=0, count=0, pad=" ", **kwargs):
         """
         Generate the sql and args
         """
@@ -280,7 +798,7 @@ class LIMITED(QUERY):
         if len(self.LIMIT) > 1:
             raise relations_sql.SQLError(self, "LIMIT can only be total")
 
-        super().generate(indent=indent, count=count, pad=pad, **kwargs)
+        yield from super().fragments(args, indent=indent, count=count, pad=pad, **kwargs)
 
 
 class UPDATE(LIMITED):
@@ -292,6 +810,7 @@ class UPDATE(LIMITED):
     PREFIX = ""
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", relations_sql.WITH),
         ("OPTIONS", relations_sql.OPTIONS),
         ("TABLE", relations_sql.TABLE_NAME),
         ("SET", relations_sql.SET),
@@ -310,6 +829,7 @@ class DELETE(LIMITED):
     PREFIX = "FROM"
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", relations_sql.WITH),
         ("OPTIONS", relations_sql.OPTIONS),
         ("TABLE", relations_sql.TABLE_NAME),
         ("WHERE", relations_sql.WHERE),
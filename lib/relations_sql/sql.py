@@ -2,6 +2,9 @@
 Base SQL module for all of Relations
 """
 
+import collections
+import threading
+
 import overscore
 
 class SQLError(Exception):
@@ -20,8 +23,10 @@ class SQL:
     Base class for every SQL expression
     """
 
-    sql = None  # The text for a query
-    args = None # The args for interpolation
+    __slots__ = (
+        "sql",  # The text for a query
+        "args"  # The args for interpolation
+    )
 
     def __init__(self, sql=None, args=None):
 
@@ -44,7 +49,87 @@ class SQL:
 
         return name, path
 
+    def shape(self, args):
+        """
+        Hashable structure of the sql, collecting the args along the way
+        """
+
+        args.extend(self.args)
+
+        return (self.__class__, self.sql)
+
     def generate(self, **kwargs):
         """
         Generate the sql and args
         """
+
+
+class CACHE:
+    """
+    Bounded least recently used cache that counts hits and misses
+    """
+
+    size = None     # max number of entries
+    hits = None     # number of successful gets
+    misses = None   # number of failed gets
+    entries = None  # the entries themselves, oldest first
+    lock = None     # keeps threads sharing a cache from interleaving
+
+    def __init__(self, size=1024):
+
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.clear()
+
+    def __len__(self):
+
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """
+        Gets a value, marking it as recently used
+        """
+
+        with self.lock:
+
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+            self.misses += 1
+
+        return default
+
+    def set(self, key, value):
+        """
+        Sets a value, dropping the least recently used if full
+        """
+
+        with self.lock:
+
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+        return value
+
+    def rate(self):
+        """
+        Fraction of gets that were hits
+        """
+
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+    def clear(self):
+        """
+        Clears the entries and counts
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
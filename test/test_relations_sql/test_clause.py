@@ -64,6 +64,10 @@ class TestCLAUSE(unittest.TestCase):
         self.assertEqual(clause.bind(query), clause)
         self.assertEqual(clause.query, query)
 
+        clause.memo = ((), "test", [])
+        clause.bind(query)
+        self.assertIsNone(clause.memo)
+
     def test_add(self):
 
         clause = UNKNOWN()
@@ -219,6 +223,60 @@ class TestARGS(unittest.TestCase):
         self.assertRaises(TypeError, clause.add, nope=False)
 
 
+class WITH(relations_sql.WITH):
+
+    CTE = test_expression.MATERIALIZEDCTE
+
+class TestWITH(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_add(self):
+
+        clause = WITH(stuff=relations_sql.SQL("a"), things=relations_sql.SQL("b"))
+
+        self.assertEqual([expression.label.name for expression in clause.expressions], ["stuff", "things"])
+        self.assertFalse(clause.recursive)
+
+        clause.add(test_expression.CTE("more", relations_sql.SQL("c")), RECURSIVE=True, MATERIALIZED=False, people=relations_sql.SQL("d"))
+
+        self.assertEqual([expression.label.name for expression in clause.expressions], ["stuff", "things", "more", "people"])
+        self.assertFalse(clause.expressions[-1].materialized)
+        self.assertTrue(clause.recursive)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need CTE or keywords, not people", clause.add, "people")
+
+    def test_shape(self):
+
+        args = []
+        clause = WITH(RECURSIVE=True, stuff=relations_sql.SQL("a", [1]))
+
+        self.assertEqual(clause.shape(args), (WITH, True, (
+            (test_expression.MATERIALIZEDCTE, None, ((test_expression.NAME, "stuff"), (relations_sql.SQL, "a"))),
+        )))
+        self.assertEqual(args, [1])
+
+    def test_generate(self):
+
+        clause = WITH()
+        self.assertFalse(clause)
+
+        clause.add(things=relations_sql.SQL("b", [2]), stuff=relations_sql.SQL("a", [1]), MATERIALIZED=True)
+        clause.generate()
+        self.assertEqual(clause.sql, """WITH `things` AS MATERIALIZED (b),`stuff` AS MATERIALIZED (a)""")
+        self.assertEqual(clause.args, [2, 1])
+
+        clause.add(RECURSIVE=True)
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """WITH RECURSIVE
+  `things` AS MATERIALIZED (
+    b
+  ),
+  `stuff` AS MATERIALIZED (
+    a
+  )""")
+
+
 class OPTIONS(relations_sql.OPTIONS):
 
     pass
@@ -383,15 +441,165 @@ class TestFROM(unittest.TestCase):
       `things` AS `stuff`""")
 
 
+class JOIN(relations_sql.JOIN):
+
+    ARGS = test_expression.VALUE
+    KWARGS = test_criteria.OP
+    TABLE = test_expression.TABLE_NAME
+    AS = test_expression.AS
+
+class LEFT_JOIN(JOIN, relations_sql.LEFT_JOIN):
+    pass
+
+class RIGHT_JOIN(JOIN, relations_sql.RIGHT_JOIN):
+    pass
+
+class FULL_JOIN(JOIN, relations_sql.FULL_JOIN):
+    pass
+
+class CROSS_JOIN(JOIN, relations_sql.CROSS_JOIN):
+    pass
+
+class TestJOIN(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        clause = JOIN("orders", test_criterion.EQ("orders.person_id", test_expression.COLUMN_NAME("people.id")), status="paid")
+
+        self.assertIsInstance(clause.table, test_expression.TABLE_NAME)
+        self.assertEqual(clause.table.name, "orders")
+        self.assertEqual(len(clause.expressions), 2)
+        self.assertIsInstance(clause.expressions[0], test_criterion.EQ)
+        self.assertIsInstance(clause.expressions[1], test_criterion.EQ)
+        self.assertEqual(clause.expressions[1].left.name, "status")
+
+        clause = JOIN("orders", AS="o")
+
+        self.assertIsInstance(clause.table, test_expression.AS)
+        self.assertEqual(clause.table.label.name, "o")
+        self.assertEqual(clause.table.expression.name, "orders")
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(LEFT_JOIN("orders", status="paid").shape(args), (LEFT_JOIN,
+            (test_expression.TABLE_NAME, None, "orders", None),
+            ((test_criterion.EQ, False, ((test_expression.COLUMN_NAME, None, "status", (), False), (test_expression.VALUE, False))),)
+        ))
+        self.assertEqual(args, ["paid"])
+
+    def test_generate(self):
+
+        clause = LEFT_JOIN("orders", test_criterion.EQ("o.person_id", test_expression.COLUMN_NAME("people.id")), AS="o", status="paid")
+
+        clause.generate()
+        self.assertEqual(clause.sql, """LEFT JOIN `orders` AS `o` ON `o`.`person_id`=`people`.`id` AND `status`=%s""")
+        self.assertEqual(clause.args, ["paid"])
+
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """LEFT JOIN
+  `orders` AS `o`
+ON
+  `o`.`person_id`=`people`.`id` AND
+  `status`=%s""")
+
+        clause = CROSS_JOIN("orders")
+
+        self.assertRaisesRegex(relations_sql.SQLError, "CROSS JOIN takes no ON", clause, status="paid")
+        self.assertRaisesRegex(relations_sql.SQLError, "CROSS JOIN takes no ON", CROSS_JOIN, "orders", status="paid")
+        self.assertEqual(clause.expressions, [])
+
+        clause.generate()
+        self.assertEqual(clause.sql, """CROSS JOIN `orders`""")
+        self.assertEqual(clause.args, [])
+
+
+class JOINS(relations_sql.JOINS):
+
+    ARGS = JOIN
+
+    JOIN = JOIN
+    LEFT_JOIN = LEFT_JOIN
+    RIGHT_JOIN = RIGHT_JOIN
+    FULL_JOIN = FULL_JOIN
+    CROSS_JOIN = CROSS_JOIN
+
+class TestJOINS(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_generate(self):
+
+        clause = JOINS()
+
+        self.assertFalse(clause)
+
+        clause("orders", RIGHT_JOIN("items", id=1), FULL_JOIN("things", id=2))
+
+        clause.generate()
+        self.assertEqual(clause.sql, """JOIN `orders` RIGHT JOIN `items` ON `id`=%s FULL JOIN `things` ON `id`=%s""")
+        self.assertEqual(clause.args, [1, 2])
+
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """JOIN
+  `orders`
+RIGHT JOIN
+  `items`
+ON
+  `id`=%s
+FULL JOIN
+  `things`
+ON
+  `id`=%s""")
+
+
 class WHERE(relations_sql.WHERE):
 
     ARGS = test_expression.VALUE
     KWARGS = test_criteria.OP
+    IN = test_criterion.IN
+    BETWEEN = test_criterion.BETWEEN
 
 class TestWHERE(unittest.TestCase):
 
     maxDiff = None
 
+    def test_key(self):
+
+        one = WHERE(things__in=[2, 1], stuff=1).add(test_criterion.EQ("a", 1), test_criterion.EQ("b", 2))
+        two = WHERE(test_criterion.EQ("b", 2), stuff=1).add(test_criterion.EQ("a", 1), things__in=[1, 2])
+
+        self.assertEqual(one.key(), two.key())
+        self.assertEqual(one.sql, """WHERE `a`=%s AND `b`=%s AND `stuff`=%s AND `things` IN (%s,%s)""")
+        self.assertEqual(one.args, [1, 2, 1, 1, 2])
+
+    def test_optimize(self):
+
+        clause = WHERE(test_criteria.AND(test_criterion.EQ("stuff", 1)), things__in=[]).add(
+            test_criteria.OR(test_criterion.EQ("a", 1), test_criterion.EQ("a", 2))
+        )
+
+        clause.optimize().generate()
+        self.assertEqual(clause.sql, """WHERE %s""")
+        self.assertEqual(clause.args, [False])
+
+        deep = test_criteria.AND(test_criterion.EQ("a", 0))
+
+        for each in range(1, 3000):
+            deep = test_criteria.AND(test_criterion.EQ("a", each), deep)
+
+        clause = WHERE(deep).optimize()
+        self.assertEqual(len(clause.expressions), 3000)
+
+        clause = WHERE(created__gte=3, created__lte=7).add(created__gte=5, created__between=[1, 6])
+
+        clause.optimize().generate()
+        self.assertEqual(clause.sql, """WHERE `created` BETWEEN %s AND %s""")
+        self.assertEqual(clause.args, [5, 6])
+
     def test___init__(self):
 
         clause = WHERE("people", stuff="things")
@@ -754,6 +962,7 @@ class TestSET(unittest.TestCase):
 class VALUES(relations_sql.VALUES):
 
     ARGS = test_expression.LIST
+    ROWS = test_expression.ROWS
 
 class TestVALUES(unittest.TestCase):
 
@@ -785,6 +994,38 @@ class TestVALUES(unittest.TestCase):
         clause.column(['4', '5', '6'])
         self.assertEqual(clause.columns, ['4', '5', '6'])
 
+    def test_rows(self):
+
+        clause = VALUES()
+
+        clause.rows({"things": [2, 4], "stuff": [1, {"a": 1}]})
+        self.assertEqual(clause.columns, ["stuff", "things"])
+        self.assertIsInstance(clause.expressions[0], test_expression.ROWS)
+        self.assertEqual(clause.expressions[0].rows[0], (1, 2))
+        self.assertEqual(clause.expressions[0].rows[1][0].value, {"a": 1})
+        self.assertEqual(clause.expressions[0].rows[1][1], 4)
+
+        clause.rows([(5, 6), [7, 8]])
+        self.assertEqual(clause.expressions[1].rows, [(5, 6), (7, 8)])
+
+        clause.rows([{"things": 10, "stuff": 9}, (11, 12)])
+        self.assertEqual(clause.expressions[2].rows, [(9, 10), (11, 12)])
+
+        clause.rows([])
+        self.assertEqual(len(clause.expressions), 3)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "missing column things in \['stuff'\]", clause.rows, {"stuff": [1]})
+        self.assertRaisesRegex(relations_sql.SQLError, "different lengths for columns \['stuff', 'things'\]", clause.rows, {"stuff": [1], "things": []})
+        self.assertRaisesRegex(relations_sql.SQLError, "wrong values \(1,\) for columns \['stuff', 'things'\]", clause.rows, [(1,)])
+        self.assertRaisesRegex(relations_sql.SQLError, "missing column things in {'stuff': 1}", clause.rows, [{"stuff": 1}])
+        self.assertRaisesRegex(relations_sql.SQLError, "row ab must be a list or tuple of values", clause.rows, ["ab"])
+
+        clause = VALUES()
+
+        clause.rows([(1, 2, 3)])
+        self.assertIsNone(clause.columns)
+        self.assertEqual(clause.expressions[0].rows, [(1, 2, 3)])
+
     def test_add(self):
 
         query = unittest.mock.MagicMock()
@@ -857,6 +1098,64 @@ class TestVALUES(unittest.TestCase):
         self.assertRaisesRegex(relations_sql.SQLError, "missing column 1 in \{'column': 'nope'\}", clause.add, column="nope")
         self.assertRaisesRegex(relations_sql.SQLError, "wrong values \('nope',\) for columns \['1', '2', '3'\]", clause.add, "nope")
 
+        clause = VALUES()
+
+        clause.add(ROWS=[(1, 2)], COLUMNS=["stuff", "things"])
+        self.assertEqual(clause.columns, ["stuff", "things"])
+        self.assertEqual(clause.expressions[0].rows, [(1, 2)])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "add ROWS by themselves", clause.add, 3, ROWS=[(1, 2)])
+
+    def test_each(self):
+
+        clause = VALUES(ROWS=[(1, 2), ({"a": 1}, 3)])
+        clause(4, relations_sql.SQL("NOW()", [5]))
+
+        self.assertEqual([(expression, index, list(args)) for expression, index, args in clause.each()], [
+            (clause.expressions[0], 0, [1, 2]),
+            (clause.expressions[0], 1, ['{"a": 1}', 3]),
+            (clause.expressions[1], None, [4, 5])
+        ])
+
+    def test_size(self):
+
+        self.assertEqual(VALUES.size([]), 0)
+        self.assertEqual(VALUES.size(["fie", 12, None, "\u00e9"]), 12 + 3 + 2 + 4 + 2)
+
+    def test_batches(self):
+
+        clause = VALUES(ROWS=[(1, 2), (3, {"a": 1}), (5, 6)])
+        clause(7, 8)
+
+        def generate(batch):
+            values = VALUES()
+            values.expressions = batch
+            values.generate()
+            return values.sql, values.args
+
+        self.assertEqual([generate(batch) for batch in clause.batches()], [
+            ("VALUES (%s,%s),(%s,JSON(%s)),(%s,%s),(%s,%s)", [1, 2, 3, '{"a": 1}', 5, 6, 7, 8])
+        ])
+
+        self.assertEqual([generate(batch) for batch in clause.batches(rows=3)], [
+            ("VALUES (%s,%s),(%s,JSON(%s)),(%s,%s)", [1, 2, 3, '{"a": 1}', 5, 6]),
+            ("VALUES (%s,%s)", [7, 8])
+        ])
+
+        self.assertEqual([generate(batch) for batch in clause.batches(placeholders=5, used=1)], [
+            ("VALUES (%s,%s),(%s,JSON(%s))", [1, 2, 3, '{"a": 1}']),
+            ("VALUES (%s,%s),(%s,%s)", [5, 6, 7, 8])
+        ])
+
+        self.assertEqual([generate(batch) for batch in clause.batches(payload=16, sized=4)], [
+            ("VALUES (%s,%s)", [1, 2]),
+            ("VALUES (%s,JSON(%s))", [3, '{"a": 1}']),
+            ("VALUES (%s,%s)", [5, 6]),
+            ("VALUES (%s,%s)", [7, 8])
+        ])
+
+        self.assertEqual(list(VALUES().batches(rows=1)), [])
+
     def test_generate(self):
 
         clause = VALUES()
@@ -899,3 +1198,22 @@ class TestVALUES(unittest.TestCase):
         %s,
         %s
       )""")
+
+        clause(ROWS=[("fie", {"a": 1})])
+
+        clause.generate()
+        self.assertEqual(clause.sql, """VALUES (%s,%s),(%s,%s),(%s,JSON(%s))""")
+        self.assertEqual(clause.args, ["fie", "fum", "fie", "fum", "fie", '{"a": 1}'])
+
+        clause.generate(indent=2)
+        self.assertEqual(clause.sql, """VALUES
+  (
+    %s,
+    %s
+  ),(
+    %s,
+    %s
+  ),(
+    %s,
+    JSON(%s)
+  )""")
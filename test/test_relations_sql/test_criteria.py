@@ -111,6 +111,195 @@ class TestCRITERIA(unittest.TestCase):
         self.assertEqual(criteria.expressions[1].label.name, "totes")
         self.assertEqual(criteria.expressions[1].expression, "maigoats")
 
+    def test_optimize(self):
+
+        EQ = test_criterion.EQ
+        IN = test_criterion.IN
+
+        criteria = AND(
+            EQ("a", 1),
+            AND(EQ("b", 2), AND(EQ("c", 3))),
+            OR(EQ("d", 4), EQ("d", 5), EQ("e", 6), EQ("d", 6), EQ("d", 7, invert=True)),
+            EQ("a", 1),
+            OR(AND(EQ("f", 8))),
+            test_expression.NOT(OR(OR(EQ("g", 9), EQ("g", 10)))),
+            AND()
+        ).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql,
+            """(`a`=%s AND `b`=%s AND `c`=%s AND (`d` IN (%s,%s,%s) OR `e`=%s OR `d`!=%s) AND `f`=%s AND NOT (`g` IN (%s,%s)))"""
+        )
+        self.assertEqual(criteria.args, [1, 2, 3, 4, 5, 6, 6, 7, 8, 9, 10])
+
+        criteria = AND(EQ("a", 1), OR(EQ("b", 2), IN("c", [], invert=True)), IN("d", [], invert=True)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a`=%s)""")
+        self.assertEqual(criteria.args, [1])
+
+        criteria = OR(IN("a", [], invert=True), IN("b", [], invert=True)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(%s)""")
+        self.assertEqual(criteria.args, [True])
+
+        criteria = AND(EQ("a", 1), OR(EQ("b", 2), IN("c", [])), OR(IN("d", []), IN("e", []))).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(%s)""")
+        self.assertEqual(criteria.args, [False])
+
+        criteria = SPACE(relations_sql.SQL("a"), relations_sql.SQL("a")).optimize()
+        self.assertEqual(len(criteria.expressions), 2)
+
+    def test_normalize(self):
+
+        EQ = test_criterion.EQ
+        IN = test_criterion.IN
+
+        criteria = AND(
+            IN("b", [3, 1, 2]),
+            OR(EQ("d", 2), EQ("c", 1)),
+            test_expression.NOT(IN("a", ["y", "x"])),
+            IN("e", [2, "x"])
+        ).normalize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """((`c`=%s OR `d`=%s) AND NOT `a` IN (%s,%s) AND `b` IN (%s,%s,%s) AND `e` IN (%s,%s))""")
+        self.assertEqual(criteria.args, [1, 2, "x", "y", 1, 2, 3, 2, "x"])
+
+        criteria = SPACE(relations_sql.SQL("b"), relations_sql.SQL("a")).normalize()
+        self.assertEqual(criteria.expressions[0].sql, "b")
+
+        deep = OR(EQ("b", 0), EQ("a", 0))
+
+        for each in range(1, 1000):
+            deep = OR(EQ("a", each), AND(EQ("b", each), deep))
+
+        deep.normalize()
+        self.assertEqual(deep.expressions[1].left.name, "a")
+        self.assertEqual(deep.expressions[0].expressions[1].left.name, "b")
+
+        one = OR(EQ("a", 0), EQ("b", 0))
+        two = OR(EQ("b", 0), EQ("a", 0))
+
+        for each in range(1, 2000):
+            one = AND(OR(one, EQ("c", each)), EQ("d", each))
+            two = AND(EQ("d", each), OR(EQ("c", each), two))
+
+        one.normalize().generate()
+        two.normalize().generate()
+        self.assertEqual(one.sql, two.sql)
+        self.assertEqual(one.args, two.args)
+
+    def test_key(self):
+
+        EQ = test_criterion.EQ
+        IN = test_criterion.IN
+
+        one = AND(EQ("a", 1), IN("b", [2, 1]), OR(EQ("c", 3), EQ("d", 4)))
+        two = AND(OR(EQ("d", 4), EQ("c", 3)), IN("b", [1, 2]), EQ("a", 1))
+
+        self.assertEqual(one.key(), two.key())
+        self.assertEqual(len({one.key(), two.key()}), 1)
+        self.assertNotEqual(one.key(), AND(EQ("a", 2), IN("b", [1, 2]), OR(EQ("c", 3), EQ("d", 4))).key())
+        self.assertNotEqual(one.key(), OR(EQ("a", 1), IN("b", [1, 2]), OR(EQ("c", 3), EQ("d", 4))).key())
+
+    def test_identify(self):
+
+        EQ = test_criterion.EQ
+
+        inner = OR(EQ("a", 1), EQ("b", 2))
+        outer = AND(EQ("c", 3), inner)
+
+        self.assertEqual(relations_sql.CRITERIA.identify(outer), ("""(`c`=%s AND (`a`=%s OR `b`=%s))""", "[3, 1, 2]"))
+
+        identities = {}
+
+        identity = relations_sql.CRITERIA.identify(inner, identities)
+        self.assertEqual(identity[:2], ("""(`a`=%s OR `b`=%s)""", "1, 2"))
+        self.assertIs(identities[id(inner)][0], inner)
+        self.assertEqual(relations_sql.CRITERIA.identify(OR(EQ("a", 1), EQ("b", 2)), identities), identity)
+        self.assertNotEqual(relations_sql.CRITERIA.identify(OR(EQ("a", 1), EQ("b", 3)), identities), identity)
+
+        identities[id(inner)] = (inner, ("(known)", "'known'", b"known"))
+
+        self.assertEqual(relations_sql.CRITERIA.identify(outer, identities)[:2], ("""(`c`=%s AND (known))""", "3, 'known'"))
+        self.assertEqual(relations_sql.CRITERIA.identify(outer, identities)[:2], ("""(`c`=%s AND (known))""", "3, 'known'"))
+
+        self.assertEqual(relations_sql.CRITERIA.identify(relations_sql.SQL("a", [1]), identities)[:2], ("a", "1"))
+
+        long = relations_sql.CRITERIA.identify(AND(*[EQ("a", value) for value in range(100)] + [EQ("b", 1)]), identities)
+        longer = relations_sql.CRITERIA.identify(AND(*[EQ("a", value) for value in range(100)] + [EQ("b", 2)]), identities)
+        self.assertEqual(len(long[0]), relations_sql.CRITERIA.HEAD)
+        self.assertEqual(long[:2], longer[:2])
+        self.assertNotEqual(long, longer)
+
+    def test_ranges(self):
+
+        GT = test_criterion.GT
+        GTE = test_criterion.GTE
+        LT = test_criterion.LT
+        LTE = test_criterion.LTE
+        BETWEEN = test_criterion.BETWEEN
+        EQ = test_criterion.EQ
+
+        criteria = AND(GTE("a", 1), LTE("a", 9), GT("b", 1), GTE("b", 3), GT("b", 3), LT("b", 5), LTE("b", 5)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a` BETWEEN %s AND %s AND `b`>%s AND `b`<%s)""")
+        self.assertEqual(criteria.args, [1, 9, 3, 5])
+
+        criteria = AND(BETWEEN("a", [1, 9]), GTE("a", 3), LT("b", 5), LT("b", 7), EQ("c", 1)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a` BETWEEN %s AND %s AND `b`<%s AND `c`=%s)""")
+        self.assertEqual(criteria.args, [3, 9, 5, 1])
+
+        criteria = AND(BETWEEN("a", [1, 9]), GTE("a", 0), GT("b", 5), GT("b", "x"), GT("c", 1), OR(GT("c", 2))).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a` BETWEEN %s AND %s AND `b`>%s AND `b`>%s AND `c`>%s)""")
+        self.assertEqual(criteria.args, [1, 9, 5, "x", 2])
+
+        criteria = AND(BETWEEN("a", [1, 9]), LT("a", 5)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a` BETWEEN %s AND %s AND `a`<%s)""")
+        self.assertEqual(criteria.args, [1, 9, 5])
+
+        criteria = OR(GT("a", 1), GT("a", 2)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a`>%s OR `a`>%s)""")
+        self.assertEqual(criteria.args, [1, 2])
+
+        criteria = AND(GTE("a", "a"), GTE("a", "B"), LT("b", 1.5), LT("b", 2)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`a`>=%s AND `a`>=%s AND `b`<%s)""")
+        self.assertEqual(criteria.args, ["a", "B", 1.5])
+
+        criteria = AND(GT("b", True), GT("b", False)).optimize()
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """(`b`>%s AND `b`>%s)""")
+        self.assertEqual(criteria.args, [True, False])
+
+    def test_shape(self):
+
+        args = []
+
+        criteria = LOGIC(False, test_criterion.EQ("totes", "maigoats"))
+        self.assertEqual(criteria.shape(args), (LOGIC, 2, (
+            (test_expression.VALUE, False),
+            (test_criterion.EQ, False, ((test_expression.COLUMN_NAME, None, "totes", (), False), (test_expression.VALUE, False)))
+        )))
+        self.assertEqual(args, [False, "maigoats"])
+
+        self.assertEqual(LOGIC().shape(args), (LOGIC, 0, ()))
+
     def test_generate(self):
 
         criteria = SPACE()
@@ -190,6 +379,8 @@ class TestCRITERIA(unittest.TestCase):
 class AND(relations_sql.AND):
 
     ARGS = test_expression.VALUE
+    IN = test_criterion.IN
+    BETWEEN = test_criterion.BETWEEN
 
 class TestAND(unittest.TestCase):
 
@@ -224,6 +415,7 @@ class TestAND(unittest.TestCase):
 class OR(relations_sql.OR):
 
     ARGS = test_expression.VALUE
+    IN = test_criterion.IN
 
 class TestOR(unittest.TestCase):
 
@@ -277,6 +469,17 @@ class TestSETS(unittest.TestCase):
         self.assertEqual(SETS.ensure({1}), {1})
         self.assertEqual(SETS.ensure([1]), [1])
 
+    def test_shape(self):
+
+        args = []
+
+        criteria = SETS("totes", ["mai", "goats"])
+        self.assertEqual(criteria.shape(args), (SETS, (AND, 2, (
+            (test_expression.COLUMN_NAME, None, "totes", (), False),
+            (test_expression.VALUE, True)
+        ))))
+        self.assertEqual(args, ['["mai", "goats"]'])
+
     def test_generate(self):
 
         criteria = SETS("totes", ["mai", "goats"])
@@ -362,6 +565,53 @@ class TestANY(unittest.TestCase):
         self.assertEqual(criteria.args, ['["mai"]', '["goats"]'])
 
 
+class OVERLAPSANY(ANY):
+
+    OVERLAPS = test_criterion.OVERLAPS
+
+class TestOVERLAPSANY(unittest.TestCase):
+
+    def test___init__(self):
+
+        criteria = OVERLAPSANY("totes", ["mai", "goats"])
+
+        self.assertIsInstance(criteria.expression, test_criterion.OVERLAPS)
+        self.assertIsInstance(criteria.expression.left, test_expression.COLUMN_NAME)
+        self.assertIsInstance(criteria.expression.right, test_expression.VALUE)
+        self.assertEqual(criteria.expression.left.name, "totes")
+        self.assertEqual(criteria.expression.right.value, ["mai", "goats"])
+
+        criteria = OVERLAPSANY(totes="goats")
+
+        self.assertEqual(criteria.expression.right.value, ["goats"])
+
+        criteria = OVERLAPSANY("totes", {"mai", "goats", "too"})
+
+        self.assertEqual(criteria.expression.right.value, {"mai", "goats", "too"})
+
+        criteria = OVERLAPSANY("totes", {1, "a"})
+
+        self.assertEqual(criteria.expression.right.value, {1, "a"})
+
+    def test_generate(self):
+
+        criteria = OVERLAPSANY("totes", ["mai", "goats"])
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """JSON_OVERLAPS(`totes`,JSON(%s))""")
+        self.assertEqual(criteria.args, ['["mai", "goats"]'])
+
+        criteria = OVERLAPSANY("totes", {"mai", "goats", "too"})
+
+        criteria.generate()
+        self.assertEqual(criteria.args, ['["goats", "mai", "too"]'])
+
+        criteria = OVERLAPSANY("totes", {"a", 1})
+
+        criteria.generate()
+        self.assertEqual(criteria.args, ['[1, "a"]'])
+
+
 class ALL(test_criterion.SQL, relations_sql.ALL):
 
     AND = AND
@@ -422,11 +672,17 @@ class OP(test_criterion.SQL, relations_sql.OP):
         'start': test_criterion.START,
         'end': test_criterion.END,
         'in': test_criterion.IN,
+        'between': test_criterion.BETWEEN,
+        'exists': test_criterion.EXISTS,
         "has": HAS,
         "any": ANY,
         "all": ALL
     }
 
+class ARRAYOP(OP):
+
+    CRITERIONS = dict(OP.CRITERIONS, **{'in': test_criterion.ANYIN})
+
 class TestOP(unittest.TestCase):
 
     def test___new__(self):
@@ -487,4 +743,45 @@ class TestOP(unittest.TestCase):
         self.assertEqual(criteria.sql, """(CONTAINS(`totes__a`,JSON(%s)) AND LENGTHS(`totes__a`,JSON(%s)))""")
         self.assertEqual(criteria.args, ['[1, 2]', '[1, 2]'])
 
+        criteria = ARRAYOP(totes__in=[1, 2], ARRAY=True)
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """`totes` = ANY(%s)""")
+        self.assertEqual(criteria.args, [[1, 2]])
+
+        criteria = ARRAYOP(totes__not_in=[1, 2, 3])
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """NOT `totes` = ANY(%s)""")
+        self.assertEqual(criteria.args, [[1, 2, 3]])
+
+        criteria = ARRAYOP(totes__in=[1, 2, 3], ARRAY=False)
+
+        criteria.generate()
+        self.assertEqual(criteria.sql, """`totes` IN (%s,%s,%s)""")
+        self.assertEqual(criteria.args, [1, 2, 3])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "ARRAY only for in, not eq", OP, totes=1, ARRAY=True)
         self.assertRaisesRegex(relations_sql.SQLError, "need single pair", OP, "nope")
+
+    def test_parse(self):
+
+        OP.FIELDS.clear()
+
+        self.assertEqual(OP.parse("totes"), ("totes", "eq", False))
+        self.assertEqual(len(OP.FIELDS), 0)
+
+        self.assertEqual(OP.parse("totes__a__in"), ("totes__a", "in", False))
+        self.assertEqual(OP.parse("totes__a__not_in"), ("totes__a", "in", True))
+        self.assertEqual(OP.parse("totes__a__not_nope"), ("totes__a__not_nope", "eq", False))
+        self.assertEqual(OP.parse("totes__a__in"), ("totes__a", "in", False))
+        self.assertEqual(OP.FIELDS.entries[(OP, "totes__a__not_in")], ("totes__a", "in", True))
+        self.assertEqual(len(OP.FIELDS), 3)
+        self.assertEqual(OP.FIELDS.hits, 1)
+        self.assertEqual(OP.FIELDS.misses, 3)
+
+        self.assertEqual(ARRAYOP.parse("totes__a__in"), ("totes__a", "in", False))
+        self.assertIn((ARRAYOP, "totes__a__in"), OP.FIELDS.entries)
+
+        OP.FIELDS.clear()
+        self.assertEqual(len(OP.FIELDS), 0)
@@ -129,6 +129,19 @@ class TestCRITERION(unittest.TestCase):
 
         self.assertEqual(len(criterion), 2)
 
+    def test_shape(self):
+
+        args = []
+        column = (test_expression.COLUMN_NAME, None, "totes", (), False)
+
+        criterion = CRITERION("totes", "maigoats", invert=True)
+        self.assertEqual(criterion.shape(args), (CRITERION, True, (column, (test_expression.VALUE, False))))
+        self.assertEqual(args, ["maigoats"])
+
+        criterion = CRITERIONREVERSE("totes", "maigoats")
+        self.assertEqual(criterion.shape(args), (CRITERIONREVERSE, False, ((test_expression.VALUE, False), column)))
+        self.assertEqual(args, ["maigoats", "maigoats"])
+
     def test_generate(self):
 
         criterion = CRITERION("totes", "maigoats")
@@ -204,6 +217,14 @@ class TestNULL(unittest.TestCase):
 
         self.assertEqual(len(criterion), 1)
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(NULL("totes", True).shape(args), (NULL, False, ((test_expression.COLUMN_NAME, None, "totes", (), False),)))
+        self.assertEqual(NULL("totes", True, invert=True).shape(args), (NULL, True, ((test_expression.COLUMN_NAME, None, "totes", (), False),)))
+        self.assertEqual(args, [])
+
     def test_generate(self):
 
         criterion = NULL("totes", True)
@@ -256,6 +277,17 @@ class TestEQ(unittest.TestCase):
         self.assertEqual(criterion.sql, """`totes`#>>%s=%s""")
         self.assertEqual(criterion.args, ['$."a"', 'maigoats'])
 
+        criterion = EQ("totes", test_expression.COLUMN_NAME("people.id"))
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes`=`people`.`id`""")
+        self.assertEqual(criterion.args, [])
+
+        criterion = EQ("totes", relations_sql.SQL("SELECT 1"))
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes`=(SELECT 1)""")
+
 
 class GT(SQL, relations_sql.GT):
     pass
@@ -415,6 +447,46 @@ class TestEND(unittest.TestCase):
         self.assertEqual(criterion.args, ['$."a"', '%maigoats'])
 
 
+class BETWEEN(SQL, relations_sql.BETWEEN):
+
+    RIGHT = test_expression.LIST
+
+class TestBETWEEN(unittest.TestCase):
+
+    def test___init__(self):
+
+        criterion = BETWEEN("totes", (1, 2))
+
+        self.assertIsInstance(criterion.right, test_expression.LIST)
+        self.assertEqual([expression.value for expression in criterion.right.expressions], [1, 2])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "BETWEEN needs low and high, not 1", BETWEEN, "totes", 1)
+        self.assertRaisesRegex(relations_sql.SQLError, r"BETWEEN needs low and high, not \[1\]", BETWEEN, "totes", [1])
+
+    def test_shape(self):
+
+        args = []
+        self.assertEqual(BETWEEN("totes", [1, 2], invert=True).shape(args), (BETWEEN, True, (
+            (test_expression.COLUMN_NAME, None, "totes", (), False),
+            (test_expression.LIST, ((test_expression.VALUE, False), (test_expression.VALUE, False)))
+        )))
+        self.assertEqual(args, [1, 2])
+
+    def test_generate(self):
+
+        criterion = BETWEEN("totes", [1, 2])
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes` BETWEEN %s AND %s""")
+        self.assertEqual(criterion.args, [1, 2])
+
+        criterion = BETWEEN(totes__a=[1, 2], invert=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes`#>>%s NOT BETWEEN %s AND %s""")
+        self.assertEqual(criterion.args, ['$."a"', 1, 2])
+
+
 class IN(SQL, relations_sql.IN):
 
     RIGHT = test_expression.LIST
@@ -422,6 +494,21 @@ class IN(SQL, relations_sql.IN):
 
 class TestIN(unittest.TestCase):
 
+    def test_shape(self):
+
+        args = []
+
+        criterion = IN("totes", ["mai", "goats"])
+        self.assertEqual(criterion.shape(args), (IN, False, (
+            (test_expression.COLUMN_NAME, None, "totes", (), False),
+            (test_expression.LIST, ((test_expression.VALUE, False), (test_expression.VALUE, False)))
+        )))
+        self.assertEqual(args, ["mai", "goats"])
+
+        criterion = IN("totes", [], invert=True)
+        self.assertEqual(criterion.shape(args), (IN, True))
+        self.assertEqual(args, ["mai", "goats", True])
+
     def test_generate(self):
 
         criterion = IN("totes", ["mai", "goats"])
@@ -449,6 +536,152 @@ class TestIN(unittest.TestCase):
         self.assertEqual(criterion.args, [False])
 
 
+class BUCKETIN(IN):
+
+    BUCKET = 2
+
+class ONEIN(IN):
+
+    BUCKET = 1
+
+class TestBUCKETIN(unittest.TestCase):
+
+    def test___init__(self):
+
+        self.assertEqual(BUCKETIN("totes", [1, 2, 3]).right.bucket, 2)
+        self.assertEqual(BUCKETIN("totes", [1, 2, 3], bucket=4).right.bucket, 4)
+        self.assertIsNone(IN("totes", [1, 2, 3]).right.bucket)
+        self.assertEqual(IN("totes", [1, 2, 3], bucket=2).right.bucket, 2)
+
+        values = relations_sql.LIST([1, 2, 3])
+        criterion = BUCKETIN(totes=values)
+        self.assertIsNot(criterion.right, values)
+        self.assertIsNone(values.bucket)
+        self.assertEqual(criterion.right.bucket, 2)
+        self.assertEqual(criterion.right.expressions, values.expressions)
+
+        values = relations_sql.LIST([1, 2, 3], bucket=2)
+        self.assertIs(BUCKETIN("totes", values).right, values)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket 1 must be an int of 2 or more", IN, "totes", [1, 2, 3], bucket=1)
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket 0 must be an int of 2 or more", BUCKETIN, "totes", [1, 2, 3], bucket=0)
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket 1 must be an int of 2 or more", ONEIN, "totes", [1, 2, 3])
+
+    def test_generate(self):
+
+        criterion = BUCKETIN("totes", ["mai", "goats", "too"])
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes` IN (%s,%s,%s,%s)""")
+        self.assertEqual(criterion.args, ["mai", "goats", "too", "too"])
+
+        criterion = BUCKETIN("totes", ["mai", "goats", "too", "four", "five"], invert=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes` NOT IN (%s,%s,%s,%s,%s,%s,%s,%s)""")
+        self.assertEqual(criterion.args, ["mai", "goats", "too", "four", "five", "five", "five", "five"])
+
+
+class ANYIN(IN):
+
+    ARRAY = "%s = ANY(%s)"
+    ARRAY_INVERT = "NOT %s = ANY(%s)"
+    ARRAY_SIZE = 3
+
+class EACHIN(IN):
+
+    ARRAY = "%s IN (SELECT value FROM json_each(%s))"
+    ARRAY_JSON = True
+
+class TestARRAYIN(unittest.TestCase):
+
+    def test___init__(self):
+
+        self.assertIsNone(ANYIN("totes", [1]).array)
+        self.assertTrue(ANYIN("totes", [1], array=True).array)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "no array without ARRAY operand", IN, "totes", [1], array=True)
+        self.assertRaisesRegex(relations_sql.SQLError, "no array without ARRAY operand", EACHIN, "totes", [1], invert=True, array=True)
+
+    def test_arrayed(self):
+
+        self.assertFalse(IN("totes", [1, 2, 3]).arrayed())
+        self.assertFalse(ANYIN("totes", [1, 2]).arrayed())
+        self.assertTrue(ANYIN("totes", [1, 2, 3]).arrayed())
+        self.assertTrue(ANYIN("totes", [1], array=True).arrayed())
+        self.assertFalse(ANYIN("totes", [1, 2, 3], array=False).arrayed())
+        self.assertFalse(ANYIN("totes", [], array=True).arrayed())
+        self.assertFalse(ANYIN("totes", [1, 2, relations_sql.SQL("NOW()")]).arrayed())
+        self.assertFalse(ANYIN("totes", [1, 2, {"a": 1}]).arrayed())
+        self.assertFalse(EACHIN("totes", [1, 2, 3], invert=True).arrayed())
+        self.assertFalse(ANYIN("totes", relations_sql.SQL("SELECT id FROM people")).arrayed())
+        self.assertFalse(ANYIN("totes", relations_sql.SQL("SELECT id FROM people"), array=True).arrayed())
+
+        criterion = ANYIN("totes", relations_sql.SQL("SELECT id FROM people"), array=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes` IN (SELECT id FROM people)""")
+
+    def test_shape(self):
+
+        args = []
+
+        criterion = ANYIN("totes", [1, 2, 3])
+        self.assertEqual(criterion.shape(args), (ANYIN, False, (test_expression.COLUMN_NAME, None, "totes", (), False)))
+        self.assertEqual(args, [[1, 2, 3]])
+
+        self.assertEqual(ANYIN("totes", [1, 2, 3, 4]).shape([]), ANYIN("totes", [5, 6, 7]).shape([]))
+
+    def test_generate(self):
+
+        criterion = ANYIN("totes", ["mai", "goats", "too"])
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes` = ANY(%s)""")
+        self.assertEqual(criterion.args, [["mai", "goats", "too"]])
+
+        criterion = ANYIN("totes", ["mai", "goats", "too"], invert=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """NOT `totes` = ANY(%s)""")
+        self.assertEqual(criterion.args, [["mai", "goats", "too"]])
+
+        criterion = EACHIN(totes__a=["mai", "goats"], array=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes`#>>%s IN (SELECT value FROM json_each(%s))""")
+        self.assertEqual(criterion.args, ['$."a"', '["mai", "goats"]'])
+
+        criterion = EACHIN("totes", ["mai", "goats"], invert=True)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """`totes` NOT IN (%s,%s)""")
+        self.assertEqual(criterion.args, ["mai", "goats"])
+
+
+class EXISTS(SQL, relations_sql.EXISTS):
+
+    pass
+
+class TestEXISTS(unittest.TestCase):
+
+    def test___init__(self):
+
+        self.assertRaisesRegex(relations_sql.SQLError, "EXISTS needs a SELECT, not totes", EXISTS, "totes")
+        self.assertRaisesRegex(relations_sql.SQLError, "EXISTS needs a SELECT, not None", EXISTS)
+        self.assertRaisesRegex(relations_sql.SQLError, "EXISTS takes just a SELECT, not orders", EXISTS, "orders", relations_sql.SELECT())
+        self.assertRaisesRegex(relations_sql.SQLError, "EXISTS takes just a SELECT, not orders", EXISTS, orders=relations_sql.SELECT())
+
+        select = relations_sql.SELECT()
+        criterion = EXISTS(select)
+        self.assertIsNone(criterion.left)
+        self.assertIs(criterion.right, select)
+
+        criterion = EXISTS(right=select, invert=True)
+        self.assertIsNone(criterion.left)
+        self.assertTrue(criterion.invert)
+
+
 class CONTAINS(SQL, relations_sql.CONTAINS):
 
     pass
@@ -464,6 +697,21 @@ class TestCONTAINS(unittest.TestCase):
         self.assertEqual(criterion.args, ['["mai", "goats"]'])
 
 
+class OVERLAPS(SQL, relations_sql.OVERLAPS):
+
+    OPERAND = "JSON_OVERLAPS(%s,%s)"
+
+class TestOVERLAPS(unittest.TestCase):
+
+    def test_generate(self):
+
+        criterion = OVERLAPS("totes", ["mai", "goats"])
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """JSON_OVERLAPS(`totes`,JSON(%s))""")
+        self.assertEqual(criterion.args, ['["mai", "goats"]'])
+
+
 class LENGTHS(SQL, relations_sql.LENGTHS):
 
     pass
@@ -1,3 +1,5 @@
+import gc
+import sys
 import unittest
 import unittest.mock
 
@@ -44,9 +46,320 @@ class TestEXPRESSION(unittest.TestCase):
         self.assertEqual(sql, ["fee", "foe"])
         self.assertEqual(expression.args, ["fie", "fum"])
 
+    def test_shape(self):
+
+        expression = QUOTED("test")
+
+        self.assertRaisesRegex(relations_sql.SQLError, "no shape for QUOTED", expression.shape, [])
+
+    def test_shapes(self):
+
+        args = []
+        expressions = [relations_sql.SQL("fee", ["fie"]), relations_sql.SQL(), relations_sql.SQL("foe", ["fum"])]
+
+        self.assertEqual(relations_sql.EXPRESSION.shapes(expressions, args), (
+            (relations_sql.SQL, "fee"),
+            (relations_sql.SQL, "foe")
+        ))
+        self.assertEqual(args, ["fie", "fum"])
+
+    def test_writes(self):
+
+        class LEGACY(VALUE):
+
+            def generate(self, **kwargs):
+
+                self.sql = "LEGACY"
+                self.args = []
+
+        self.assertTrue(relations_sql.EXPRESSION.writes(QUOTED))
+        self.assertTrue(relations_sql.EXPRESSION.writes(VALUE))
+        self.assertFalse(relations_sql.EXPRESSION.writes(LEGACY))
+        self.assertFalse(relations_sql.EXPRESSION.writes(relations_sql.SQL))
+
+    def test_pieces(self):
+
+        self.assertEqual(relations_sql.EXPRESSION.pieces("%s"), ("", ""))
+        self.assertEqual(relations_sql.EXPRESSION.pieces("%s LIKE %s"), ("", " LIKE ", ""))
+        self.assertEqual(relations_sql.EXPRESSION.pieces("CAST(%s AS JSON)"), ("CAST(", " AS JSON)"))
+        self.assertEqual(relations_sql.EXPRESSION.pieces("%s%%%s"), ("", "%", ""))
+
+    def test_delimit(self):
+
+        fee = relations_sql.SQL("fee")
+        fie = relations_sql.SQL()
+        foe = relations_sql.SQL("foe")
+
+        self.assertEqual(list(relations_sql.EXPRESSION.delimit([fee, fie, foe], ",", count=1)), [
+            (fee, {"count": 1}),
+            (fie, {"count": 1}),
+            ",",
+            (foe, {"count": 1})
+        ])
+
+    def test_fragments(self):
+
+        args = []
+        self.assertEqual(list(QUOTED("test", ["unit"]).fragments(args)), ["test"])
+        self.assertEqual(args, ["unit"])
+
+        args = []
+        self.assertEqual(list(QUOTED().fragments(args)), [])
+        self.assertEqual(args, [])
+
+    def test_recall(self):
+
+        sql = []
+        args = []
+        expression = QUOTED()
+
+        self.assertFalse(expression.recall((), sql, args))
+
+        expression.memo = ((("indent", 2),), "test", ["unit"])
+
+        self.assertFalse(expression.recall((), sql, args))
+        self.assertEqual(sql, [])
+        self.assertEqual(args, [])
+
+        self.assertTrue(expression.recall((("indent", 2),), sql, args))
+        self.assertEqual(sql, ["test"])
+        self.assertEqual(args, ["unit"])
+
+    def test_remember(self):
+
+        sql = ["fee", "fie", "foe"]
+        args = [1, 2]
+        expression = QUOTED()
+
+        expression.remember((), sql, args, 1, 1)
+        self.assertEqual(sql, ["fee", "fiefoe"])
+        self.assertEqual(expression.memo, ((), "fiefoe", [2]))
+
+        expression.remember((("count", 1),), sql, args, 1, 2)
+        self.assertEqual(sql, ["fee", "fiefoe"])
+        self.assertEqual(expression.memo, ((("count", 1),), "fiefoe", []))
+
+        expression.remember((), sql, args, 2, 2)
+        self.assertEqual(sql, ["fee", "fiefoe", ""])
+        self.assertEqual(expression.memo, ((), "", []))
+
+    def test_formatting(self):
+
+        self.assertEqual(relations_sql.EXPRESSION.formatting({}), ())
+        self.assertEqual(relations_sql.EXPRESSION.formatting({"indent": 0, "count": 2, "pad": " "}), (("indent", 0),))
+        self.assertEqual(relations_sql.EXPRESSION.formatting({"count": 2, "unit": "test"}), (("unit", "test"),))
+        self.assertEqual(
+            relations_sql.EXPRESSION.formatting({"indent": 2, "count": 1, "pad": " "}),
+            (("indent", 2), ("count", 1), ("pad", " "))
+        )
+
+    def test_remembered(self):
+
+        fee = QUOTED()
+        fie = QUOTED()
+        foe = QUOTED()
+
+        foe.remembered(fee)
+        self.assertIs(foe.parents(), fee)
+
+        foe.remembered(fee)
+        self.assertIs(foe.parents(), fee)
+
+        foe.remembered(fie)
+        self.assertEqual(set(foe.parents), {fee, fie})
+
+        del fie
+        gc.collect()
+        self.assertEqual(set(foe.parents), {fee})
+
+        fum = QUOTED()
+        fum.remembered(QUOTED())
+        gc.collect()
+        self.assertIsNone(fum.parents())
+
+        fum.remembered(fee)
+        self.assertIs(fum.parents(), fee)
+
+    def test_dirty(self):
+
+        fee = QUOTED()
+        fie = QUOTED()
+        foe = QUOTED()
+        fum = QUOTED()
+
+        for expression in [fee, fie, foe, fum]:
+            expression.memo = ((), "test", [])
+
+        foe.remembered(fie)
+        foe.remembered(fee)
+        fie.remembered(fee)
+        fee.remembered(QUOTED())
+        gc.collect()
+
+        foe.dirty()
+
+        for expression in [fee, fie, foe]:
+            self.assertIsNone(expression.memo)
+            self.assertIsNone(expression.parents)
+
+        self.assertIsNotNone(fum.memo)
+
+        fum.memo = None
+        fum.dirty()
+        self.assertIsNone(fum.parents)
+
+    def test_write(self):
+
+        class LEGACY(VALUE):
+
+            def generate(self, **kwargs):
+
+                self.sql = f"LEGACY{kwargs}"
+                self.args = ["legacy"]
+
+        class WRITER(QUOTED):
+
+            def fragments(self, args, **kwargs):
+
+                yield "("
+                yield VALUE("unit"), {}
+                yield ","
+                yield LEGACY("test"), {"count": 1}
+                yield ","
+                yield relations_sql.SQL("fee", ["fie"]), {}
+                yield relations_sql.SQL(), {}
+                yield ")"
+
+        sql = ["WRITE "]
+        args = ["write"]
+        expression = WRITER()
+
+        expression.write(sql, args)
+        self.assertEqual(sql, ["WRITE ", "(", "%s", ",", "LEGACY{'count': 1}", ",", "fee", ")"])
+        self.assertEqual(args, ["write", "unit", "legacy", "fie"])
+        self.assertIsNone(expression.memo)
+
+        class REMEMBERED(QUOTED):
+
+            MEMO = True
+            PARENTS = True
+
+            def fragments(self, args, **kwargs):
+
+                yield "("
+                yield VALUE("unit"), {}
+                yield ")"
+
+        class REMEMBERS(QUOTED):
+
+            MEMO = True
+
+            def fragments(self, args, **kwargs):
+
+                yield "["
+                yield remembered, {"count": 1}
+                yield "]"
+
+        remembered = REMEMBERED()
+        expression = REMEMBERS()
+
+        sql = ["WRITE "]
+        args = ["write"]
+
+        expression.write(sql, args)
+        self.assertEqual(sql, ["WRITE ", "[(%s)]"])
+        self.assertEqual(args, ["write", "unit"])
+        self.assertEqual(expression.memo, ((), "[(%s)]", ["unit"]))
+        self.assertEqual(remembered.memo, ((), "(%s)", ["unit"]))
+        self.assertIs(remembered.parents(), expression)
+
+        sql = []
+        args = []
+
+        remembered.memo = ((), "(remembered)", [])
+
+        expression.write(sql, args)
+        self.assertEqual(sql, ["[(%s)]"])
+
+        expression.memo = None
+
+        expression.write(sql, args)
+        self.assertEqual(sql, ["[(%s)]", "[(remembered)]"])
+        self.assertIs(remembered.parents(), expression)
+
+        other = REMEMBERS()
+
+        other.write([], [])
+        self.assertEqual(set(remembered.parents), {expression, other})
+
+        other.write([], [], count=2)
+        self.assertEqual(set(remembered.parents), {expression, other})
+
+        remembered.dirty()
+        self.assertIsNone(expression.memo)
+
+        expression.write(sql, args, indent=1)
+        self.assertEqual(sql, ["[(%s)]", "[(remembered)]", "[(%s)]"])
+        self.assertEqual(expression.memo, ((("indent", 1),), "[(%s)]", ["unit"]))
+
+        class PLAIN(QUOTED):
+
+            PARENTS = True
+
+            def fragments(self, args, **kwargs):
+
+                yield "{"
+                yield remembered, {}
+                yield "}"
+
+        plain = PLAIN()
+        expression = REMEMBERS()
+
+        expression.write([], [])
+        self.assertIsNone(plain.memo)
+        self.assertIsNone(plain.parents)
+
+        class KEEPS(QUOTED):
+
+            MEMO = True
+
+            def fragments(self, args, **kwargs):
+
+                yield plain, {}
+
+        keeps = KEEPS()
+
+        keeps.write([], [])
+        self.assertIs(plain.parents(), keeps)
+        self.assertIn(keeps, remembered.parents)
+
+        value = VALUE("unit")
+
+        class VALUES(REMEMBERED):
+
+            def fragments(self, args, **kwargs):
+
+                yield value, {}
+
+        VALUES().write([], [])
+        self.assertIsNone(value.parents)
+
+    def test_generate(self):
+
+        expression = QUOTED("test", ["unit"])
+
+        expression.generate()
+        self.assertEqual(expression.sql, "test")
+        self.assertEqual(expression.args, ["unit"])
+
+        expression.generate()
+        self.assertEqual(expression.sql, "test")
+        self.assertEqual(expression.args, ["unit"])
+
 
 class VALUE(test_sql.SQL, relations_sql.VALUE):
-    pass
+
+    __slots__ = ()
 
 class TestVALUE(unittest.TestCase):
 
@@ -66,6 +379,51 @@ class TestVALUE(unittest.TestCase):
         self.assertEqual(expression.value, {"a": 1})
         self.assertTrue(expression.jsonify)
 
+    def test___slots__(self):
+
+        expression = relations_sql.VALUE("unit")
+        self.assertFalse(hasattr(expression, "__dict__"))
+        self.assertFalse(hasattr(expression, "__weakref__"))
+        self.assertIsNone(expression.memo)
+        self.assertIsNone(expression.parents)
+        self.assertRaisesRegex(AttributeError, "object has no attribute 'nope'", getattr, expression, "nope")
+
+        expression = VALUE("unit")
+        self.assertFalse(hasattr(expression, "__dict__"))
+
+        class LEGACY(VALUE):
+
+            def __init__(self, value): # pylint: disable=super-init-not-called
+
+                self.value = value
+                self.jsonify = False
+
+        expression = LEGACY(1)
+        self.assertIsNone(expression.memo)
+        self.assertIsNone(expression.parents)
+
+        expression.generate()
+        self.assertEqual(expression.sql, "%s")
+        self.assertEqual(expression.args, [1])
+
+        criterion = NOT(expression)
+        criterion.generate()
+        self.assertEqual(criterion.sql, "NOT %s")
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(VALUE("unit").shape(args), (VALUE, False))
+        self.assertEqual(VALUE({'a', 'b'}).shape(args), (VALUE, True))
+        self.assertEqual(args, ["unit", '["a", "b"]'])
+
+    def test_dumps(self):
+
+        self.assertEqual(VALUE.dumps({"b", "a"}), '["a", "b"]')
+        self.assertEqual(VALUE.dumps({"a", 2, 1}), '[1, 2, "a"]')
+        self.assertEqual(VALUE.dumps({"a": 1}), '{"a": 1}')
+
     def test_generate(self):
 
         expression = VALUE(None)
@@ -111,6 +469,13 @@ class TestNOT(unittest.TestCase):
         expression = NOT(relations_sql.SQL("test"))
         self.assertEqual(expression.expression.sql, """test""")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(NOT("unit").shape(args), (NOT, (VALUE, False)))
+        self.assertEqual(args, ["unit"])
+
     def test_generate(self):
 
         expression = NOT("unit")
@@ -126,6 +491,13 @@ class TestNOT(unittest.TestCase):
         expression.generate(indent=2)
         self.assertEqual(expression.sql, """NOT test""")
 
+        expression = "unit"
+        for _ in range(sys.getrecursionlimit() * 2):
+            expression = NOT(expression)
+        expression.generate()
+        self.assertEqual(expression.sql, "NOT " * sys.getrecursionlimit() * 2 + "%s")
+        self.assertEqual(expression.args, ["unit"])
+
 
 class LIST(test_sql.SQL, relations_sql.LIST):
 
@@ -161,6 +533,12 @@ class TestLIST(unittest.TestCase):
         self.assertEqual(expression.expressions[1].value, {"b": 2})
         self.assertTrue(expression.expressions[1].jsonify)
 
+        self.assertEqual(LIST(["unit"], bucket=2).bucket, 2)
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket 1 must be an int of 2 or more", LIST, ["unit"], bucket=1)
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket 0 must be an int of 2 or more", LIST, ["unit"], bucket=0)
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket 2.5 must be an int of 2 or more", LIST, ["unit"], bucket=2.5)
+        self.assertRaisesRegex(relations_sql.SQLError, "bucket True must be an int of 2 or more", LIST, ["unit"], bucket=True)
+
     def test___len__(self):
 
         expression = LIST([])
@@ -169,6 +547,28 @@ class TestLIST(unittest.TestCase):
         expression = LIST(["unit", "test"])
         self.assertEqual(len(expression), 2)
 
+    def test_padded(self):
+
+        expression = LIST(["unit", "test", "this"])
+        self.assertEqual(expression.padded(), expression.expressions)
+
+        expression = LIST(["unit", "test", "this"], bucket=2)
+        self.assertEqual(expression.padded(), expression.expressions + [expression.expressions[-1]])
+
+        expression = LIST(["unit", "test", "this", "that", "thing"], bucket=4)
+        self.assertEqual(len(expression.padded()), 16)
+        self.assertEqual(len(expression), 5)
+
+        expression = LIST(["unit"], bucket=2)
+        self.assertEqual(expression.padded(), expression.expressions)
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(LIST(["unit", {"a": 1}]).shape(args), (LIST, ((VALUE, False), (VALUE, True))))
+        self.assertEqual(args, ["unit", '{"a": 1}'])
+
     def test_generate(self):
 
         expression = LIST(["unit", "test"])
@@ -198,6 +598,98 @@ JSON(%s)""")
         self.assertEqual(expression.sql, """JSON(%s),
     JSON(%s)""")
 
+        expression = LIST(["unit", "test", "this"], bucket=2)
+        expression.generate()
+        self.assertEqual(expression.sql, """%s,%s,%s,%s""")
+        self.assertEqual(expression.args, ["unit", "test", "this", "this"])
+
+        args = []
+        self.assertEqual(expression.shape(args), LIST(["unit", "test", "this", "that"]).shape([]))
+        self.assertEqual(args, ["unit", "test", "this", "this"])
+
+
+class ROWS(test_sql.SQL, relations_sql.ROWS):
+
+    ARG = VALUE
+
+class TestROWS(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        expression = ROWS([["unit", 1], ("test", None)])
+        self.assertEqual(expression.rows, [("unit", 1), ("test", None)])
+        self.assertEqual(expression.mixed, set())
+
+        now = relations_sql.SQL("NOW()")
+        expression = ROWS([("unit", 1), ({"a": 1}, now)])
+        self.assertEqual(expression.rows[0], ("unit", 1))
+        self.assertIsInstance(expression.rows[1][0], VALUE)
+        self.assertEqual(expression.rows[1][0].value, {"a": 1})
+        self.assertIs(expression.rows[1][1], now)
+        self.assertEqual(expression.mixed, {1})
+
+        self.assertRaisesRegex(relations_sql.SQLError, "wrong values \('nope',\) for width 2", ROWS, [(1, 2), ("nope",)])
+        self.assertRaisesRegex(relations_sql.SQLError, "row {'a': 1} must be a list or tuple of values", ROWS, [{"a": 1}])
+        self.assertRaisesRegex(relations_sql.SQLError, "row ab must be a list or tuple of values", ROWS, ["ab"])
+
+    def test___len__(self):
+
+        self.assertEqual(len(ROWS([])), 0)
+        self.assertEqual(len(ROWS([(1, 2), (3, 4)])), 2)
+
+    def test_slice(self):
+
+        expression = ROWS([(1, 2), ({"a": 1}, 3), (4, 5), (6, {"b": 2})]).slice(1, 3)
+        self.assertIsInstance(expression, ROWS)
+        self.assertEqual(expression.rows[0][0].value, {"a": 1})
+        self.assertEqual(expression.rows[1], (4, 5))
+        self.assertEqual(expression.mixed, {0})
+
+    def test_row(self):
+
+        expression = ROWS([(1, 2), ({"a": 1}, 3)])
+
+        args = []
+        self.assertIsNone(expression.row(0, args))
+        self.assertEqual(args, [1, 2])
+
+        args = []
+        self.assertEqual(expression.row(1, args), ((VALUE, True), None))
+        self.assertEqual(args, ['{"a": 1}', 3])
+
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(ROWS([(1, 2), ({"a": 1}, 3)]).shape(args), (ROWS, 2, 2, ((1, ((VALUE, True), None)),)))
+        self.assertEqual(args, [1, 2, '{"a": 1}', 3])
+
+    def test_generate(self):
+
+        expression = ROWS([(1, 2), (3, 4), ({"a": 1}, relations_sql.SQL("NOW()")), (5, 6), (7, {"b": 2})])
+
+        expression.generate()
+        self.assertEqual(expression.sql, """%s,%s),(%s,%s),(JSON(%s),NOW()),(%s,%s),(%s,JSON(%s)""")
+        self.assertEqual(expression.args, [1, 2, 3, 4, '{"a": 1}', 5, 6, 7, '{"b": 2}'])
+
+        expression.generate(indent=2, count=2)
+        self.assertEqual(expression.sql, """%s,
+    %s
+  ),(
+    %s,
+    %s
+  ),(
+    JSON(%s),
+    NOW()
+  ),(
+    %s,
+    %s
+  ),(
+    %s,
+    JSON(%s)""")
+
 
 class NAME(test_sql.SQL, relations_sql.NAME):
     pass
@@ -228,6 +720,13 @@ class TestNAME(unittest.TestCase):
         expression = NAME("people")
         self.assertEqual(len(expression), 1)
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(NAME("people").shape(args), (NAME, "people"))
+        self.assertEqual(args, [])
+
     def test_generate(self):
 
         expression = NAME("people")
@@ -344,6 +843,14 @@ class TestTABLE_NAME(unittest.TestCase):
         self.assertEqual(expression.name, "stuff")
         self.assertEqual(expression.schema, schema)
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(TABLE_NAME("stuff").shape(args), (TABLE_NAME, None, "stuff", None))
+        self.assertEqual(TABLE_NAME("people.stuff", prefix="PRE").shape(args), (TABLE_NAME, (SCHEMA_NAME, "people"), "stuff", "PRE"))
+        self.assertEqual(args, [])
+
     def test_generate(self):
 
         expression = TABLE_NAME("people.stuff", prefix="things")
@@ -480,6 +987,26 @@ class TestCOLUMN_NAME(unittest.TestCase):
         self.assertEqual(expression.path, [])
         self.assertFalse(expression.jsonify)
 
+    def test_parse(self):
+
+        COLUMN_NAME.PATHS.clear()
+
+        expression = COLUMN_NAME('a')
+        self.assertEqual(expression.parse("things__a__0"), ("things", ["a", 0], '$."a"[0]'))
+        self.assertEqual(expression.parse("things"), ("things", [], None))
+        self.assertNotIn((COLUMN_NAME, "things"), COLUMN_NAME.PATHS.entries)
+        self.assertEqual(expression.parse("1"), (1, [], None))
+        self.assertEqual(COLUMN_NAME.PATHS.entries[(COLUMN_NAME, "things__a__0")], ("things", ("a", 0), '$."a"[0]'))
+
+        expression.parse("things__a__0")[1].append(1)
+        self.assertEqual(expression.parse("things__a__0"), ("things", ["a", 0], '$."a"[0]'))
+
+        expression = COLUMN_NAME("stuff.things__a__0")
+        self.assertEqual(expression.walked, '$."a"[0]')
+        self.assertEqual(COLUMN_NAME.PATHS.hits, 3)
+
+        COLUMN_NAME.PATHS.clear()
+
     def test_column(self):
 
         expression = COLUMN_NAME("people.stuff.things")
@@ -487,6 +1014,19 @@ class TestCOLUMN_NAME(unittest.TestCase):
 
         self.assertEqual(expression.column(), "`people`.`stuff`.`things`")
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(COLUMN_NAME("things", jsonify=True).shape(args), (COLUMN_NAME, None, "things", (), True))
+        self.assertEqual(args, [])
+
+        table = relations_sql.SQL("test", ["unit"])
+
+        expression = COLUMN_NAME("people.stuff.things__a__0", table=table)
+        self.assertEqual(expression.shape(args), (COLUMN_NAME, (relations_sql.SQL, "test"), "things", ("a", 0), False))
+        self.assertEqual(args, ["unit", '$."a"[0]'])
+
     def test_generate(self):
 
         expression = COLUMN_NAME("*")
@@ -612,6 +1152,14 @@ class TestAS(unittest.TestCase):
         expression = AS("people", column)
         self.assertEqual(len(expression), 2)
 
+    def test_shape(self):
+
+        args = []
+        column = relations_sql.SQL("test", ["unit"])
+
+        self.assertEqual(AS("people", column).shape(args), (AS, ((relations_sql.SQL, "test"), (NAME, "people"))))
+        self.assertEqual(args, ["unit"])
+
     def test_generate(self):
 
         column = relations_sql.SQL("test", ["unit"])
@@ -632,6 +1180,69 @@ class TestAS(unittest.TestCase):
         self.assertEqual(expression.sql, """test AS unit""")
 
 
+class CTE(test_sql.SQL, relations_sql.CTE):
+
+    NAME = NAME
+
+class MATERIALIZEDCTE(CTE):
+
+    MATERIALIZED = "%s AS MATERIALIZED %s"
+    NOT_MATERIALIZED = "%s AS NOT MATERIALIZED %s"
+
+class TestCTE(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        query = relations_sql.SQL("test", ["unit"])
+
+        expression = CTE("people", query)
+        self.assertIsInstance(expression.label, NAME)
+        self.assertEqual(expression.label.name, "people")
+        self.assertEqual(expression.expression, query)
+        self.assertIsNone(expression.materialized)
+
+        self.assertTrue(MATERIALIZEDCTE("people", query, materialized=True).materialized)
+        self.assertRaisesRegex(relations_sql.SQLError, "no materialized without MATERIALIZED operand", CTE, "people", query, materialized=False)
+
+    def test___len__(self):
+
+        self.assertEqual(len(CTE("people", relations_sql.SQL("test", ["unit"]))), 2)
+
+    def test_shape(self):
+
+        args = []
+        query = relations_sql.SQL("test", ["unit"])
+
+        self.assertEqual(MATERIALIZEDCTE("people", query, materialized=False).shape(args),
+            (MATERIALIZEDCTE, False, ((NAME, "people"), (relations_sql.SQL, "test")))
+        )
+        self.assertEqual(args, ["unit"])
+
+    def test_generate(self):
+
+        query = relations_sql.SQL("test", ["unit"])
+
+        expression = CTE("people", query)
+        expression.generate()
+        self.assertEqual(expression.sql, """`people` AS (test)""")
+        self.assertEqual(expression.args, ["unit"])
+
+        expression.generate(indent=2)
+        self.assertEqual(expression.sql, """`people` AS (
+  test
+)""")
+
+        expression = MATERIALIZEDCTE("people", query, materialized=True)
+        expression.generate()
+        self.assertEqual(expression.sql, """`people` AS MATERIALIZED (test)""")
+
+        expression = MATERIALIZEDCTE("people", query, materialized=False)
+        expression.generate()
+        self.assertEqual(expression.sql, """`people` AS NOT MATERIALIZED (test)""")
+
+
 ASC = relations_sql.ASC
 DESC = relations_sql.DESC
 
@@ -674,6 +1285,13 @@ class TestORDER(unittest.TestCase):
         expression = ORDER("people")
         self.assertEqual(len(expression), 1)
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(ORDER("people", DESC).shape(args), (ORDER, ((COLUMN_NAME, None, "people", (), False),), DESC))
+        self.assertEqual(args, [])
+
     def test_generate(self):
 
         expression = ORDER("people")
@@ -733,6 +1351,13 @@ class TestASSIGN(unittest.TestCase):
         expression = ASSIGN("people", "stuff")
         self.assertEqual(len(expression), 2)
 
+    def test_shape(self):
+
+        args = []
+
+        self.assertEqual(ASSIGN("people", "stuff").shape(args), (ASSIGN, ((NAME, "people"), (VALUE, False))))
+        self.assertEqual(args, ["stuff"])
+
     def test_generate(self):
 
         expression = ASSIGN("people", "stuff")
@@ -1,10 +1,13 @@
+import sys
 import unittest
 import unittest.mock
 
 import test_expression
 import test_criterion
+import test_criteria
 import test_clause
 
+import gc
 import copy
 import collections
 
@@ -120,6 +123,39 @@ class TestQUERY(unittest.TestCase):
       query.delete(True, a=1)
       model.delete.assert_called_once_with(True, a=1, query=query)
 
+    def test_shape(self):
+
+        args = []
+        query = QUERY(SELECT="people.stuff", FROM="things")
+
+        self.assertEqual(query.shape(args), (QUERY, (
+            (test_clause.FIELDS, 1, ((test_expression.COLUMN_NAME, (test_expression.TABLE_NAME, None, "people", None), "stuff", (), False),)),
+            (test_clause.FROM, 1, ((test_expression.TABLE_NAME, None, "things", None),))
+        )))
+        self.assertEqual(args, [])
+
+    def test_key(self):
+
+        args = []
+        query = QUERY(SELECT="people.stuff", FROM="things")
+
+        self.assertIsNone(query.key(args))
+
+        query.STATEMENTS = relations_sql.CACHE()
+
+        self.assertEqual(query.key(args, indent=2), (2, 0, " ", query.shape([])))
+        self.assertIsNone(query.key(args, nope=True))
+
+        query.FROM(relations_sql.EXPRESSION())
+        self.assertIsNone(query.key(args))
+
+        query = QUERY(SELECT="people.stuff", FROM="things")
+        query.STATEMENTS = relations_sql.CACHE()
+
+        for _ in range(sys.getrecursionlimit() * 2):
+            query.FROM = relations_sql.NOT(query.FROM)
+        self.assertIsNone(query.key(args))
+
     def test_generate(self):
 
         query = QUERY(SELECT="people.stuff", FROM="things")
@@ -169,9 +205,11 @@ DESC = test_expression.DESC
 class SELECT(relations_sql.SELECT):
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", test_clause.WITH),
         ("OPTIONS", test_clause.OPTIONS),
         ("FIELDS", test_clause.FIELDS),
         ("FROM", test_clause.FROM),
+        ("JOINS", test_clause.JOINS),
         ("WHERE", test_clause.WHERE),
         ("GROUP_BY", test_clause.GROUP_BY),
         ("HAVING", test_clause.HAVING),
@@ -179,6 +217,12 @@ class SELECT(relations_sql.SELECT):
         ("LIMIT", test_clause.LIMIT)
     ])
 
+    AND = test_criteria.AND
+    OR = test_criteria.OR
+    EQ = test_criterion.EQ
+    GT = test_criterion.GT
+    LT = test_criterion.LT
+
 class TestSELECT(unittest.TestCase):
 
     maxDiff = None
@@ -225,6 +269,307 @@ class TestSELECT(unittest.TestCase):
         self.assertEqual(query.WHERE.expressions[0].left.name, "stuff")
         self.assertEqual(query.WHERE.expressions[0].right.value, "things")
 
+    def test_join(self):
+
+        person = test_expression.COLUMN_NAME("people.id")
+
+        query = SELECT("people.name", "o.total").FROM("people").JOIN(
+            "orders", test_criterion.EQ("o.person_id", person), AS="o", total__gt=5
+        ).LEFT_JOIN(
+            "addresses", {"addresses.person_id": person}
+        ).CROSS_JOIN("settings").WHERE(stuff=1)
+
+        self.assertIsInstance(query.JOINS.expressions[0], test_clause.JOIN)
+        self.assertIsInstance(query.JOINS.expressions[1], test_clause.LEFT_JOIN)
+        self.assertIsInstance(query.JOINS.expressions[2], test_clause.CROSS_JOIN)
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "SELECT `people`.`name`,`o`.`total` FROM `people` "
+            "JOIN `orders` AS `o` ON `o`.`person_id`=`people`.`id` AND `total`>%s "
+            "LEFT JOIN `addresses` ON `addresses`.`person_id`=`people`.`id` "
+            "CROSS JOIN `settings` "
+            "WHERE `stuff`=%s"
+        )
+        self.assertEqual(query.args, [5, 1])
+
+        query.RIGHT_JOIN("items", id=2).FULL_JOIN("things", id=3)
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "SELECT `people`.`name`,`o`.`total` FROM `people` "
+            "JOIN `orders` AS `o` ON `o`.`person_id`=`people`.`id` AND `total`>%s "
+            "LEFT JOIN `addresses` ON `addresses`.`person_id`=`people`.`id` "
+            "CROSS JOIN `settings` "
+            "RIGHT JOIN `items` ON `id`=%s "
+            "FULL JOIN `things` ON `id`=%s "
+            "WHERE `stuff`=%s"
+        )
+        self.assertEqual(query.args, [5, 2, 3, 1])
+
+        query = SELECT("*").FROM("people").LEFT_JOIN("orders", {"orders.person_id": person})
+        counted = query.counted()
+
+        counted.generate()
+        self.assertEqual(counted.sql,
+            "SELECT COUNT(*) AS `count` FROM `people` LEFT JOIN `orders` ON `orders`.`person_id`=`people`.`id`"
+        )
+
+    def test_exists(self):
+
+        orders = SELECT("*").FROM("orders").WHERE(
+            test_criterion.EQ("orders.person_id", test_expression.COLUMN_NAME("people.id")),
+            total__gt=5
+        )
+
+        criterion = test_criterion.EXISTS(orders)
+
+        criterion.generate()
+        self.assertEqual(criterion.sql, """EXISTS (SELECT * FROM `orders` WHERE `orders`.`person_id`=`people`.`id` AND `total`>%s)""")
+        self.assertEqual(criterion.args, [5])
+
+        query = SELECT("*").FROM("people").WHERE(stuff=1, orders__not_exists=orders)
+
+        self.assertIsInstance(query.WHERE.expressions[0], test_criterion.EXISTS)
+        self.assertIsNone(query.WHERE.expressions[0].left)
+        self.assertTrue(query.WHERE.expressions[0].invert)
+        self.assertIs(query.WHERE.expressions[0].right, orders)
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "SELECT * FROM `people` WHERE "
+            "NOT EXISTS (SELECT * FROM `orders` WHERE `orders`.`person_id`=`people`.`id` AND `total`>%s) AND `stuff`=%s"
+        )
+        self.assertEqual(query.args, [5, 1])
+
+        query.generate(indent=2)
+        self.assertEqual(query.sql, """SELECT
+  *
+FROM
+  `people`
+WHERE
+  NOT EXISTS (
+    SELECT
+      *
+    FROM
+      `orders`
+    WHERE
+      `orders`.`person_id`=`people`.`id` AND
+      `total`>%s
+  ) AND
+  `stuff`=%s""")
+
+    def test_with(self):
+
+        ids = SELECT("id").FROM("people").WHERE(stuff=1)
+
+        query = SELECT("*").WITH(ids=ids, MATERIALIZED=True).FROM("orders").WHERE(
+            person_id__in=SELECT("id").FROM("ids"),
+            seller_id__in=SELECT("id").FROM("ids")
+        )
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "WITH `ids` AS MATERIALIZED (SELECT `id` FROM `people` WHERE `stuff`=%s) "
+            "SELECT * FROM `orders` WHERE `person_id` IN (SELECT `id` FROM `ids`) AND `seller_id` IN (SELECT `id` FROM `ids`)"
+        )
+        self.assertEqual(query.args, [1])
+
+        query.generate(indent=2)
+        self.assertEqual(query.sql, """WITH
+  `ids` AS MATERIALIZED (
+    SELECT
+      `id`
+    FROM
+      `people`
+    WHERE
+      `stuff`=%s
+  )
+SELECT
+  *
+FROM
+  `orders`
+WHERE
+  `person_id` IN (
+    SELECT
+      `id`
+    FROM
+      `ids`
+  ) AND
+  `seller_id` IN (
+    SELECT
+      `id`
+    FROM
+      `ids`
+  )""")
+
+        counted = SELECT("id").WITH(ids=ids).OPTIONS("DISTINCT").FROM("ids").counted()
+
+        counted.generate()
+        self.assertEqual(counted.sql,
+            "WITH `ids` AS (SELECT `id` FROM `people` WHERE `stuff`=%s) "
+            "SELECT COUNT(*) AS `count` FROM (SELECT DISTINCT `id` FROM `ids`) AS `counted`"
+        )
+        self.assertEqual(counted.args, [1])
+
+        query = SELECT("*").WITH(
+            test_expression.CTE("tree", relations_sql.SQL("SELECT 1 UNION ALL SELECT n+1 FROM tree")), RECURSIVE=True
+        ).FROM("tree")
+
+        query.generate()
+        self.assertEqual(query.sql, "WITH RECURSIVE `tree` AS (SELECT 1 UNION ALL SELECT n+1 FROM tree) SELECT * FROM `tree`")
+
+    def test_counted(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff=1).ORDER_BY("id").seek([5], 10)
+        counted = query.counted()
+
+        counted.generate()
+        self.assertEqual(counted.sql, """SELECT COUNT(*) AS `count` FROM `people` WHERE `stuff`=%s""")
+        self.assertEqual(counted.args, [1])
+        self.assertIn(query.seeking, query.WHERE.expressions)
+
+        counted = query.counted(cap=100)
+
+        counted.generate()
+        self.assertEqual(counted.sql, """SELECT COUNT(*) AS `count` FROM (SELECT 1 FROM `people` WHERE `stuff`=%s LIMIT %s) AS `counted`""")
+        self.assertEqual(counted.args, [1, 101])
+
+        query = SELECT("*").OPTIONS("FAST").FROM("people").WHERE(stuff=1).ORDER_BY("id").LIMIT(10, 20)
+        counted = query.counted()
+
+        counted.generate()
+        self.assertEqual(counted.sql, """SELECT COUNT(*) AS `count` FROM `people` WHERE `stuff`=%s""")
+        self.assertEqual(counted.args, [1])
+        self.assertIs(counted.WHERE, query.WHERE)
+
+        query.WHERE(things=2)
+
+        counted.generate()
+        self.assertEqual(counted.sql, """SELECT COUNT(*) AS `count` FROM `people` WHERE `stuff`=%s AND `things`=%s""")
+        self.assertEqual(counted.args, [1, 2])
+
+        query = SELECT("*").OPTIONS("DISTINCT").FROM("people").WHERE(stuff=1).ORDER_BY("id").LIMIT(10)
+
+        counted = query.counted()
+
+        counted.generate()
+        self.assertEqual(counted.sql, """SELECT COUNT(*) AS `count` FROM (SELECT DISTINCT * FROM `people` WHERE `stuff`=%s) AS `counted`""")
+        self.assertEqual(counted.args, [1])
+
+        query = SELECT("name").FROM("people").GROUP_BY("name").HAVING(things=2).ORDER_BY("id").LIMIT(10)
+
+        counted = query.counted()
+
+        counted.generate()
+        self.assertEqual(counted.sql,
+            """SELECT COUNT(*) AS `count` FROM (SELECT `name` FROM `people` GROUP BY `name` HAVING `things`=%s) AS `counted`"""
+        )
+        self.assertEqual(counted.args, [2])
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT `name` FROM `people` GROUP BY `name` HAVING `things`=%s ORDER BY `id` LIMIT %s""")
+        self.assertEqual(query.args, [2, 10])
+
+        counted = query.counted(100)
+
+        counted.generate()
+        self.assertEqual(counted.sql,
+            """SELECT COUNT(*) AS `count` FROM (SELECT `name` FROM `people` GROUP BY `name` HAVING `things`=%s LIMIT %s) AS `counted`"""
+        )
+        self.assertEqual(counted.args, [2, 101])
+
+        query = SELECT("*").OPTIONS("FAST").FROM("people").WHERE(stuff=1).ORDER_BY("id").LIMIT(10, 20)
+        counted = query.counted(10000)
+
+        counted.generate()
+        self.assertEqual(counted.sql, """SELECT COUNT(*) AS `count` FROM (SELECT 1 FROM `people` WHERE `stuff`=%s LIMIT %s) AS `counted`""")
+        self.assertEqual(counted.args, [1, 10001])
+        self.assertIs(counted.FROM.expressions[0].expression.WHERE, query.WHERE)
+        self.assertIs(counted.FROM.expressions[0].expression.FROM, query.FROM)
+
+    def test_seek(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff=1).ORDER_BY("id")
+        query.generate()
+
+        query.seek([5], 10).generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff`=%s AND `id`>%s ORDER BY `id` LIMIT %s""")
+        self.assertEqual(query.args, [1, 5, 10])
+
+        query = SELECT("*").FROM("people").ORDER_BY("id").LIMIT(10, 50)
+        query.generate()
+
+        query.seek([5]).generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `id`>%s ORDER BY `id` LIMIT %s""")
+        self.assertEqual(query.args, [5, 10])
+
+        query = SELECT("*").FROM("people").ORDER_BY("name", id=relations_sql.DESC).LIMIT(10, 20)
+
+        query.seek({"name": "a", "id": 5}, 10).generate()
+        self.assertEqual(query.sql,
+            """SELECT * FROM `people` WHERE (`name`>%s OR (`name`=%s AND `id`<%s)) ORDER BY `name`,`id` DESC LIMIT %s"""
+        )
+        self.assertEqual(query.args, ["a", "a", 5, 10])
+
+        sql = query.sql
+
+        query.seek(["b", 6]).generate()
+        self.assertEqual(query.sql, sql)
+        self.assertEqual(query.args, ["b", "b", 6, 10])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need ORDER_BY to seek", SELECT("*").seek, [1])
+        self.assertRaisesRegex(relations_sql.SQLError, r"need 2 values to seek, not \[1\]", query.seek, [1])
+        self.assertRaisesRegex(relations_sql.SQLError, "missing id in {'name': 'a'}", query.seek, {"name": "a"})
+
+        query.unseek().generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` ORDER BY `name`,`id` DESC LIMIT %s""")
+        self.assertIsNone(query.seeking)
+
+    def test_chunks(self):
+
+        table = [{"id": id} for id in range(1, 8)]
+        sqls = []
+
+        def fetch(query):
+            query.generate()
+            sqls.append(query.sql)
+            after = query.args[-2] if query.seeking else 0
+            return [row for row in table if row["id"] > after][:query.args[-1]]
+
+        query = SELECT("*").FROM("people").LIMIT(100, 5)
+
+        self.assertEqual([[row["id"] for row in rows] for rows in query.chunks("id", 3, fetch)], [[1, 2, 3], [4, 5, 6], [7]])
+        self.assertEqual(sqls, [
+            """SELECT * FROM `people` ORDER BY `id` LIMIT %s""",
+            """SELECT * FROM `people` WHERE `id`>%s ORDER BY `id` LIMIT %s""",
+            """SELECT * FROM `people` WHERE `id`>%s ORDER BY `id` LIMIT %s"""
+        ])
+        self.assertEqual(query.chunked, {"size": 3, "chunks": 3, "rows": 7})
+
+        table = table[:6]
+
+        self.assertEqual(len(list(query.chunks("id", 3, fetch))), 2)
+        self.assertEqual(query.chunked, {"size": 3, "chunks": 3, "rows": 6})
+
+        query = SELECT("*").FROM("people").ORDER_BY(name=relations_sql.DESC)
+        chunks = query.chunks(["name", "id"], 2)
+
+        self.assertIs(next(chunks), query)
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` ORDER BY `name` DESC,`id` LIMIT %s""")
+        self.assertEqual(query.args, [2])
+
+        self.assertIs(chunks.send({"name": "b", "id": 2}), query)
+        query.generate()
+        self.assertEqual(query.sql,
+            """SELECT * FROM `people` WHERE (`name`<%s OR (`name`=%s AND `id`>%s)) ORDER BY `name` DESC,`id` LIMIT %s"""
+        )
+        self.assertEqual(query.args, ["b", "b", 2, 2])
+
+        self.assertRaises(StopIteration, chunks.send, None)
+        self.assertEqual(query.chunked, {"size": 2, "chunks": 2, "rows": 0})
+
     def test_generate(self):
 
         query = SELECT("*").OPTIONS("FAST").FROM("people").WHERE(stuff__gt="things")
@@ -370,10 +715,131 @@ LIMIT %s OFFSET %s""")
       `yang` DESC
     LIMIT %s OFFSET %s""")
 
+    def test_generate_statements(self):
+
+        statements = relations_sql.CACHE()
+
+        query = SELECT("*").FROM("people").WHERE(stuff__in=[1, 2], things__a=3)
+        query.STATEMENTS = statements
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things`#>>%s=%s""")
+        self.assertEqual(query.args, [1, 2, '$."a"', 3])
+        self.assertEqual((statements.hits, statements.misses, len(statements)), (0, 1, 1))
+
+        query = SELECT("*").FROM("people").WHERE(stuff__in=[4, 5], things__a=6)
+        query.STATEMENTS = statements
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things`#>>%s=%s""")
+        self.assertEqual(query.args, [4, 5, '$."a"', 6])
+        self.assertEqual((statements.hits, statements.misses, len(statements)), (1, 1, 1))
+
+        query.WHERE(yin__null=True)
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things`#>>%s=%s AND `yin` IS NULL""")
+        self.assertEqual(query.args, [4, 5, '$."a"', 6])
+        self.assertEqual((statements.hits, statements.misses, len(statements)), (1, 2, 2))
+
+        query.generate(indent=2)
+        self.assertEqual(query.sql, """SELECT
+  *
+FROM
+  `people`
+WHERE
+  `stuff` IN (
+    %s,
+    %s
+  ) AND
+  `things`#>>%s=%s AND
+  `yin` IS NULL""")
+        self.assertEqual((statements.hits, statements.misses, len(statements)), (1, 3, 3))
+
+    def test_generate_memo(self):
+
+        query = SELECT("*").FROM("people").WHERE(stuff__in=[1, 2])
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff` IN (%s,%s)""")
+        self.assertEqual(query.args, [1, 2])
+        self.assertEqual(query.memo, ((("indent", 0),), query.sql, query.args))
+        self.assertEqual(query.WHERE.memo[1:], ("""WHERE `stuff` IN (%s,%s)""", [1, 2]))
+
+        criterion = query.WHERE.expressions[0]
+        self.assertIsNone(criterion.memo)
+        self.assertIsNone(criterion.parents)
+        self.assertIs(criterion.left.parents(), query.WHERE)
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff` IN (%s,%s)""")
+        self.assertEqual(query.args, [1, 2])
+
+        query.WHERE(things=3)
+        self.assertIsNone(query.memo)
+        self.assertIsNone(query.WHERE.memo)
+        self.assertIs(criterion.left.parents(), query.WHERE)
+        self.assertIsNotNone(query.FROM.memo)
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` WHERE `stuff` IN (%s,%s) AND `things`=%s""")
+        self.assertEqual(query.args, [1, 2, 3])
+
+        query.FROM.expressions[0].set("stuff.things")
+        self.assertIsNone(query.memo)
+        self.assertIsNone(query.FROM.memo)
+        self.assertIsNotNone(query.WHERE.memo)
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `stuff`.`things` WHERE `stuff` IN (%s,%s) AND `things`=%s""")
+
+        query.LIMIT = test_clause.LIMIT(5).bind(query)
+        self.assertIsNone(query.memo)
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `stuff`.`things` WHERE `stuff` IN (%s,%s) AND `things`=%s LIMIT %s""")
+        self.assertEqual(query.args, [1, 2, 3, 5])
+
+        query.generate(indent=2)
+        self.assertEqual(query.sql, """SELECT
+  *
+FROM
+  `stuff`.`things`
+WHERE
+  `stuff` IN (
+    %s,
+    %s
+  ) AND
+  `things`=%s
+LIMIT %s""")
+        self.assertEqual(query.args, [1, 2, 3, 5])
+
+        query = SELECT("*").FROM("people")
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people`""")
+
+        query.HAVING(stuff=1)
+
+        query.generate()
+        self.assertEqual(query.sql, """SELECT * FROM `people` HAVING `stuff`=%s""")
+        self.assertEqual(query.args, [1])
+
+        query = SELECT("*").FROM("people").WHERE(stuff=1)
+        query.generate()
+
+        for _ in range(100):
+            query.counted().generate()
+
+        gc.collect()
+
+        self.assertLessEqual(len(query.WHERE.parents), 2)
+
 
 class INSERT(relations_sql.INSERT):
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", test_clause.WITH),
         ("OPTIONS", test_clause.OPTIONS),
         ("TABLE", test_expression.TABLE_NAME),
         ("COLUMNS", test_expression.COLUMN_NAMES),
@@ -381,6 +847,10 @@ class INSERT(relations_sql.INSERT):
         ("SELECT", SELECT)
     ])
 
+class CHUNKED(INSERT):
+
+    CHUNK_PLACEHOLDERS = 6
+
 class TestINSERT(unittest.TestCase):
 
     maxDiff = None
@@ -409,6 +879,21 @@ class TestINSERT(unittest.TestCase):
         self.assertEqual(query.COLUMNS.expressions[0].name, "things")
         self.assertEqual(query.VALUES.expressions[0].expressions[0].value, "*")
 
+        query = INSERT("people.stuff", ROWS={"things": ["*", "&"]})
+
+        self.assertEqual(query.COLUMNS.expressions[0].name, "things")
+        self.assertEqual(query.VALUES.expressions[0].rows, [("*",), ("&",)])
+
+        query = INSERT("people.stuff", "things", ROWS=[["*"]])
+
+        self.assertEqual(query.COLUMNS.expressions[0].name, "things")
+        self.assertEqual(query.VALUES.expressions[0].rows, [("*",)])
+
+        query = INSERT("people.stuff", ROWS=[{"things": "*", "stuff": 1}, {"stuff": 2, "things": "&"}])
+
+        self.assertEqual([column.name for column in query.COLUMNS.expressions], ["stuff", "things"])
+        self.assertEqual(query.VALUES.expressions[0].rows, [(1, "*"), (2, "&")])
+
         query = INSERT("people.stuff", COLUMNS=["things"], SELECT=SELECT("stuff").FROM("things"))
 
         self.assertEqual(query.TABLE.name, "stuff")
@@ -444,6 +929,181 @@ class TestINSERT(unittest.TestCase):
         query.column(["thingies"])
         self.assertEqual(query.COLUMNS.expressions[0].name, "things")
 
+    def test_head(self):
+
+        query = INSERT("people").OPTIONS("FAST").VALUES(stuff=1, things=2)
+
+        self.assertEqual(query.head(), ("INSERT FAST INTO `people` (`stuff`,`things`) ", []))
+
+        self.assertEqual(query.head(indent=2), ("""INSERT
+  FAST
+INTO
+  `people`
+  (
+    `stuff`,
+    `things`
+  )
+""", []))
+
+    def test_with(self):
+
+        ids = SELECT("id").FROM("people").WHERE(stuff=1)
+
+        query = INSERT("people").WITH(ids=ids).VALUES(stuff=1, things=2)
+
+        self.assertEqual(query.head(), (
+            "WITH `ids` AS (SELECT `id` FROM `people` WHERE `stuff`=%s) INSERT INTO `people` (`stuff`,`things`) ", [1]
+        ))
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "WITH `ids` AS (SELECT `id` FROM `people` WHERE `stuff`=%s) INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)"
+        )
+        self.assertEqual(query.args, [1, 1, 2])
+
+        query = INSERT("people", "id", WITH={"ids": ids}, SELECT=SELECT("id").FROM("ids"))
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "WITH `ids` AS (SELECT `id` FROM `people` WHERE `stuff`=%s) INSERT INTO `people` (`id`) SELECT `id` FROM `ids`"
+        )
+        self.assertEqual(query.args, [1])
+
+    def test_chunks(self):
+
+        query = INSERT("people").VALUES(stuff=1, things=2).VALUES(ROWS=[(3, 4), (5, {"a": 1})]).VALUES(7, 8)
+
+        self.assertEqual(list(query.chunks(rows=2)), [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", [1, 2, 3, 4]),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s)),(%s,%s)", [5, '{"a": 1}', 7, 8])
+        ])
+
+        query.generate(indent=2)
+        self.assertEqual(list(query.chunks(indent=2)), [(query.sql, query.args)])
+
+        query = CHUNKED("people").VALUES(stuff=1, things=2).VALUES(3, 4).VALUES(5, 6).VALUES(7, 8)
+
+        self.assertEqual(list(query.chunks()), [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s),(%s,%s)", [1, 2, 3, 4, 5, 6]),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", [7, 8])
+        ])
+
+        query = INSERT("people").OPTIONS("FAST")
+        query.SELECT("stuff").FROM("things")
+
+        self.assertEqual(list(query.chunks(rows=1)), [("INSERT FAST INTO `people` SELECT `stuff` FROM `things`", [])])
+
+        query = INSERT("people").VALUES(stuff=1, things=2)
+        query.SELECT("stuff").FROM("things")
+
+        self.assertRaisesRegex(relations_sql.SQLError, "set VALUES or SELECT but not both", list, query.chunks())
+
+    def test_stream(self):
+
+        def rows():
+            yield {"stuff": 1, "things": 2}
+            yield (3, 4)
+            yield [5, {"a": 1}]
+
+        query = INSERT("people")
+        streamed = rows()
+        statements = query.stream(streamed, rows=2)
+
+        self.assertEqual(next(statements), ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", [1, 2, 3, 4]))
+        self.assertEqual(next(streamed), [5, {"a": 1}])
+        self.assertEqual(list(statements), [])
+
+        query = INSERT("people", "stuff", "things").VALUES(0, 0)
+
+        self.assertEqual(list(query.stream(rows(), placeholders=4)), [
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", [0, 0]),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s),(%s,%s)", [1, 2, 3, 4]),
+            ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s))", [5, '{"a": 1}'])
+        ])
+
+        self.assertEqual(list(query.stream(rows(), rows=3, indent=2))[1], ("""INSERT
+INTO
+  `people`
+  (
+    `stuff`,
+    `things`
+  )
+VALUES
+  (
+    %s,
+    %s
+  ),(
+    %s,
+    %s
+  ),(
+    %s,
+    JSON(%s)
+  )""", [1, 2, 3, 4, 5, '{"a": 1}']))
+
+        self.assertEqual(list(CHUNKED("people", "stuff").stream([[1], [2], [3], [4], [5], [6], [7]])), [
+            ("INSERT INTO `people` (`stuff`) VALUES (%s),(%s),(%s),(%s),(%s),(%s)", [1, 2, 3, 4, 5, 6]),
+            ("INSERT INTO `people` (`stuff`) VALUES (%s)", [7])
+        ])
+
+        self.assertEqual(list(INSERT("people").stream([], rows=2)), [])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need most rows, placeholders, or payload to stream", list, INSERT("people").stream(rows()))
+        self.assertRaisesRegex(relations_sql.SQLError, "wrong values \\(1, 2\\) for columns \\['stuff'\\]", list, INSERT("people", "stuff").stream([(1, 2)], rows=2))
+
+        query = INSERT("people")
+        query.SELECT("stuff").FROM("things")
+
+        self.assertRaisesRegex(relations_sql.SQLError, "set VALUES or SELECT but not both", list, query.stream(rows(), rows=2))
+
+    def test_many(self):
+
+        query = INSERT("people").VALUES(stuff=1, things=2).VALUES(ROWS=[(3, 4), (5, 6)])
+
+        self.assertEqual(query.many(), ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,%s)", [(1, 2), (3, 4), (5, 6)]))
+
+        self.assertEqual(query.many(indent=2), ("""INSERT
+INTO
+  `people`
+  (
+    `stuff`,
+    `things`
+  )
+VALUES
+  (
+    %s,
+    %s
+  )""", [(1, 2), (3, 4), (5, 6)]))
+
+        query = INSERT("people", ROWS={"stuff": [1, 3], "things": [{"a": 1}, {"b": 2}]})
+
+        self.assertEqual(query.many(), ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s))", [(1, '{"a": 1}'), (3, '{"b": 2}')]))
+
+        query.VALUES(7, None)
+        query.VALUES(ROWS=[(9, None), (11, ["x"])])
+
+        self.assertEqual(query.many(), ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s))", [
+            (1, '{"a": 1}'), (3, '{"b": 2}'), (7, None), (9, None), (11, '["x"]')
+        ]))
+
+        query.VALUES(ROWS=[(13, "x")])
+
+        self.assertRaisesRegex(relations_sql.SQLError, "row VALUES \\(%s,%s\\) differs from VALUES \\(%s,JSON\\(%s\\)\\) for many", query.many)
+
+        query = INSERT("people").VALUES(stuff=1, things=None).VALUES(stuff=2, things={"a": 1})
+
+        self.assertEqual(query.many(), ("INSERT INTO `people` (`stuff`,`things`) VALUES (%s,JSON(%s))", [(1, None), (2, '{"a": 1}')]))
+
+        query.VALUES(3, relations_sql.SQL("NOW()"))
+
+        self.assertRaisesRegex(relations_sql.SQLError, "row VALUES \\(%s,NOW\\(\\)\\) differs from VALUES \\(%s,JSON\\(%s\\)\\) for many", query.many)
+
+        self.assertRaisesRegex(relations_sql.SQLError, "need VALUES for many", INSERT("people").many)
+
+        query = INSERT("people").VALUES(stuff=1, things=2)
+        query.SELECT("stuff").FROM("things")
+
+        self.assertRaisesRegex(relations_sql.SQLError, "set VALUES or SELECT but not both", query.many)
+
     def test_generate(self):
 
         query = INSERT("people").VALUES(stuff=1, things=2).VALUES(3, 4)
@@ -610,6 +1270,7 @@ class TestLIMITED(unittest.TestCase):
 class UPDATE(relations_sql.UPDATE):
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", test_clause.WITH),
         ("OPTIONS", test_clause.OPTIONS),
         ("TABLE", test_expression.TABLE_NAME),
         ("SET", test_clause.SET),
@@ -630,6 +1291,19 @@ class TestUPDATE(unittest.TestCase):
         self.assertEqual(query.TABLE.name, "stuff")
         self.assertEqual(query.TABLE.schema.name, "people")
 
+    def test_with(self):
+
+        query = UPDATE("people", WITH={"ids": SELECT("id").FROM("people").WHERE(stuff=1)}).SET(things=2).WHERE(
+            id__in=SELECT("id").FROM("ids")
+        )
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "WITH `ids` AS (SELECT `id` FROM `people` WHERE `stuff`=%s) "
+            "UPDATE `people` SET `things`=%s WHERE `id` IN (SELECT `id` FROM `ids`)"
+        )
+        self.assertEqual(query.args, [1, 2])
+
     def test_generate(self):
 
         query = UPDATE("people").SET(stuff="things").WHERE(things="stuff")
@@ -686,6 +1360,7 @@ LIMIT %s""")
 class DELETE(relations_sql.DELETE):
 
     CLAUSES = collections.OrderedDict([
+        ("WITH", test_clause.WITH),
         ("OPTIONS", test_clause.OPTIONS),
         ("TABLE", test_expression.TABLE_NAME),
         ("WHERE", test_clause.WHERE),
@@ -705,6 +1380,19 @@ class TestDELETE(unittest.TestCase):
         self.assertEqual(query.TABLE.name, "stuff")
         self.assertEqual(query.TABLE.schema.name, "people")
 
+    def test_with(self):
+
+        query = DELETE("people").WITH(ids=SELECT("id").FROM("people").WHERE(stuff=1)).WHERE(
+            id__in=SELECT("id").FROM("ids")
+        )
+
+        query.generate()
+        self.assertEqual(query.sql,
+            "WITH `ids` AS (SELECT `id` FROM `people` WHERE `stuff`=%s) "
+            "DELETE FROM `people` WHERE `id` IN (SELECT `id` FROM `ids`)"
+        )
+        self.assertEqual(query.args, [1])
+
     def test_generate(self):
 
         query = DELETE("people").WHERE(things="stuff")
@@ -1,11 +1,14 @@
 import unittest
 import unittest.mock
+import threading
 
 import relations_sql
 
 
 class SQL:
 
+    __slots__ = ()
+
     QUOTE = '`'
     STR = "'"
     SEPARATOR = '.'
@@ -64,7 +67,114 @@ class TestSQL(unittest.TestCase):
 
         self.assertEqual(relations_sql.SQL.split("people_stuff__a__0___1____2_____3"), ("people_stuff", ["a", 0, -1, "2", "-3"]))
 
+    def test_shape(self):
+
+        args = []
+        sql = relations_sql.SQL("unit", ["test"])
+
+        self.assertEqual(sql.shape(args), (relations_sql.SQL, "unit"))
+        self.assertEqual(args, ["test"])
+
     def test_generate(self):
 
         sql = relations_sql.SQL()
         sql.generate()
+
+
+class TestCACHE(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        cache = relations_sql.CACHE(2)
+
+        self.assertEqual(cache.size, 2)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(cache.entries, {})
+
+    def test___len__(self):
+
+        cache = relations_sql.CACHE()
+        self.assertEqual(len(cache), 0)
+
+        cache.set("unit", "test")
+        self.assertEqual(len(cache), 1)
+
+    def test_get(self):
+
+        cache = relations_sql.CACHE(2)
+
+        self.assertIsNone(cache.get("unit"))
+        self.assertEqual(cache.get("unit", "test"), "test")
+        self.assertEqual(cache.misses, 2)
+
+        cache.set("unit", "test")
+        cache.set("people", "stuff")
+
+        self.assertEqual(cache.get("unit"), "test")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(list(cache.entries), ["people", "unit"])
+
+    def test_get_threads(self):
+
+        cache = relations_sql.CACHE(4)
+        errors = []
+
+        def churn(start):
+            try:
+                for index in range(2000):
+                    key = (start + index) % 8
+                    if cache.get(key) is None:
+                        cache.set(key, key)
+            except Exception as exception: # pylint: disable=broad-except
+                errors.append(exception)
+
+        threads = [threading.Thread(target=churn, args=(start,)) for start in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 16000)
+        self.assertLessEqual(len(cache), 4)
+
+    def test_set(self):
+
+        cache = relations_sql.CACHE(2)
+
+        self.assertEqual(cache.set("unit", "test"), "test")
+        cache.set("people", "stuff")
+        cache.get("unit")
+        cache.set("things", "yep")
+
+        self.assertEqual(cache.entries, {"unit": "test", "things": "yep"})
+
+    def test_rate(self):
+
+        cache = relations_sql.CACHE()
+        self.assertEqual(cache.rate(), 0.0)
+
+        cache.set("unit", "test")
+        cache.get("unit")
+        cache.get("unit")
+        cache.get("nope")
+        cache.get("nope")
+        self.assertEqual(cache.rate(), 0.5)
+
+    def test_clear(self):
+
+        cache = relations_sql.CACHE()
+
+        cache.set("unit", "test")
+        cache.get("unit")
+        cache.get("nope")
+        cache.clear()
+
+        self.assertEqual(cache.entries, {})
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)